@@ -23,6 +23,11 @@ class VideJob(BaseModel):
     current_step: str = ""
     report_id: Optional[str] = None
     error: Optional[str] = None
+    attempts: int = 0
+    available_at: Optional[datetime] = None
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    last_error: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -67,6 +72,15 @@ class SentenceClarity(BaseModel):
     word_count: int
     clarity_rating: str
     suggestion: str
+    start: Optional[float] = None
+    end: Optional[float] = None
+
+class SentenceClarityMetrics(BaseModel):
+    sentence_count: int
+    average_words: float
+    rating_counts: Dict[str, int]
+    long_sentence_ratio: float
+    longest_sentences: List[SentenceClarity]
 
 class CommunicationMetrics(BaseModel):
     speaking_rate: float
@@ -76,24 +90,43 @@ class CommunicationMetrics(BaseModel):
     filler_rate: float
     pitch_mean: Optional[float] = None
     pitch_variability: Optional[float] = None
-    sentence_clarity: List[SentenceClarity]
+    sentence_clarity: SentenceClarityMetrics
+
+class FacialExpressions(BaseModel):
+    neutral: float = Field(ge=0, le=100)
+    positive: float = Field(ge=0, le=100)
+    negative: float = Field(ge=0, le=100)
 
 class PresenceMetrics(BaseModel):
-    posture_score: float
-    eye_contact_ratio: float
-    facial_expression_balance: Dict[str, float]
-    gesture_rate: float
+    posture_score: float = Field(ge=0, le=100)
+    eye_contact_ratio: float = Field(ge=0, le=1)
+    facial_expressions: FacialExpressions
+    gesture_rate: float = Field(ge=0)
+    first_impression_score: float = Field(ge=0, le=100)
+    notes: Optional[str] = None
 
 class GravitasMetrics(BaseModel):
-    commanding_presence: float
-    decisiveness: float
-    poise_under_pressure: float
-    emotional_intelligence: float
-    vision_articulation: float
+    commanding_presence: float = Field(ge=0, le=100)
+    decisiveness: float = Field(ge=0, le=100)
+    poise_under_pressure: float = Field(ge=0, le=100)
+    emotional_intelligence: float = Field(ge=0, le=100)
+    vision_articulation: float = Field(ge=0, le=100)
+    overall_gravitas: float = Field(ge=0, le=100)
+    key_observations: List[str]
 
 class StorytellingMetrics(BaseModel):
     has_story: bool
-    narrative_structure: Optional[float] = None
-    authenticity: Optional[float] = None
-    concreteness: Optional[float] = None
-    pacing: Optional[float] = None
\ No newline at end of file
+    narrative_structure: Optional[float] = Field(default=None, ge=0, le=100)
+    authenticity: Optional[float] = Field(default=None, ge=0, le=100)
+    concreteness: Optional[float] = Field(default=None, ge=0, le=100)
+    pacing: Optional[float] = Field(default=None, ge=0, le=100)
+    story_excerpt: Optional[str] = None
+    observations: List[str]
+
+class CoachingTips(BaseModel):
+    tips: List[str] = Field(min_length=1)
+
+class CombinedNLPAnalysis(BaseModel):
+    gravitas: GravitasMetrics
+    storytelling: StorytellingMetrics
+    coaching_tips: List[str] = Field(min_length=1)
@@ -23,6 +23,8 @@ def create_sharing_router(db):
         )
         if not report:
             raise HTTPException(status_code=404, detail="Report not found")
+        if report.get("status", "completed") != "completed":
+            raise HTTPException(status_code=409, detail="Report is still being generated")
 
         share_id = f"share_{uuid.uuid4().hex}"
         now = datetime.now(timezone.utc)
@@ -19,8 +19,9 @@ from models.user import UserCreate, User, LoginRequest, SignupRequest, AuthRespo
 from models.video import JobStatus, VideoMetadata, EPReport
 from models.profile import ProfileCreateRequest, UserProfile
 from utils.auth import hash_password, verify_password, create_session_token, get_current_user
-from utils.gridfs_helper import save_video_to_gridfs, get_video_from_gridfs
-from services.video_processor import VideoProcessorService
+from utils.gridfs_helper import save_video_to_gridfs, get_video_from_gridfs, VideoTooLargeError, MAX_VIDEO_SIZE
+from services.job_queue import VideoJobQueue, QueueFullError, ANALYSIS_TIERS
+from services.openai_client import get_openai_client, endpoint_limit, close_openai_client
 from routes.profile import create_profile_router
 from routes.subscription import get_subscription_routes
 from services.timed_content import (
@@ -44,13 +45,8 @@ db = client[os.environ['DB_NAME']]
 app = FastAPI()
 api_router = APIRouter(prefix="/api")
 
-video_processor = None
-
-def get_video_processor():
-    global video_processor
-    if video_processor is None:
-        video_processor = VideoProcessorService(db)
-    return video_processor
+job_queue = VideoJobQueue(db)
+worker_processes = []
 
 @api_router.post("/auth/signup")
 async def signup(request: SignupRequest, response: Response):
@@ -190,16 +186,21 @@ async def upload_video(
 ):
     user = await get_current_user(db, session_token, authorization)
     
-    if file.size and file.size > 200 * 1024 * 1024:
+    if file.size and file.size > MAX_VIDEO_SIZE:
         raise HTTPException(status_code=400, detail="Video size exceeds 200MB limit")
     
-    video_id = await save_video_to_gridfs(db, file)
+    try:
+        stored = await save_video_to_gridfs(db, file)
+    except VideoTooLargeError:
+        raise HTTPException(status_code=400, detail="Video size exceeds 200MB limit")
+    video_id = stored["video_id"]
     
     metadata_doc = {
         "video_id": video_id,
         "user_id": user["user_id"],
         "filename": file.filename,
-        "file_size": file.size or 0,
+        "file_size": stored["size"],
+        "sha256": stored["sha256"],
         "format": file.content_type,
         "uploaded_at": datetime.now(timezone.utc).isoformat(),
         "retention_policy": "30_days",
@@ -222,6 +223,8 @@ async def upload_video(
 @api_router.post("/videos/{video_id}/process")
 async def process_video(
     video_id: str,
+    tier: str = "full",
+    refine: bool = False,
     session_token: Optional[str] = Cookie(None),
     authorization: Optional[str] = Header(None)
 ):
@@ -230,6 +233,8 @@ async def process_video(
     metadata = await db.video_metadata.find_one({"video_id": video_id, "user_id": user["user_id"]}, {"_id": 0})
     if not metadata:
         raise HTTPException(status_code=404, detail="Video not found")
+    if tier not in ANALYSIS_TIERS:
+        raise HTTPException(status_code=400, detail=f"tier must be one of: {', '.join(ANALYSIS_TIERS)}")
     
     job_id = f"job_{uuid.uuid4().hex}"
     
@@ -237,6 +242,9 @@ async def process_video(
         "job_id": job_id,
         "user_id": user["user_id"],
         "video_id": video_id,
+        # "fast" returns a heuristic preview in seconds; with refine the full analysis follows
+        "tier": tier,
+        "refine": refine and tier == "fast",
         "status": "pending",
         "progress": 0.0,
         "current_step": "Initializing...",
@@ -244,10 +252,10 @@ async def process_video(
         "updated_at": datetime.now(timezone.utc).isoformat()
     }
     
-    await db.video_jobs.insert_one(job_doc)
-    
-    processor = get_video_processor()
-    asyncio.create_task(processor.process_video(job_id, video_id, user["user_id"]))
+    try:
+        await job_queue.enqueue(job_doc)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     
     return {"job_id": job_id, "message": "Processing started"}
 
@@ -263,8 +271,46 @@ async def get_job_status(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    # Sections are published to the report as stages finish; include what is ready so far
+    if job.get("report_id"):
+        job["report"] = await db.ep_reports.find_one(
+            {"report_id": job["report_id"]},
+            {"_id": 0, "status": 1, "sections_ready": 1, "refinement_status": 1, "overall_score": 1,
+             "communication_score": 1, "presence_score": 1, "gravitas_score": 1, "storytelling_score": 1}
+        )
+        job["sections_ready"] = (job["report"] or {}).get("sections_ready", [])
+    
     return job
 
+@api_router.post("/jobs/{job_id}/retry")
+async def retry_job(
+    job_id: str,
+    session_token: Optional[str] = Cookie(None),
+    authorization: Optional[str] = Header(None)
+):
+    user = await get_current_user(db, session_token, authorization)
+    
+    job = await db.video_jobs.find_one({"job_id": job_id, "user_id": user["user_id"]}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.get("status") != "failed":
+        raise HTTPException(status_code=400, detail="Only failed jobs can be retried")
+    
+    try:
+        requeued = await job_queue.requeue_failed(job_id, user["user_id"])
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    if not requeued:
+        raise HTTPException(status_code=409, detail="Job is already being retried")
+    
+    checkpoints = await db.job_artifacts.find({"job_id": job_id}, {"_id": 0, "stage": 1}).to_list(None)
+    
+    return {
+        "job_id": job_id,
+        "resumed_stages": sorted(c["stage"] for c in checkpoints),
+        "message": "Processing resumed"
+    }
+
 @api_router.get("/reports/{report_id}")
 async def get_report(
     report_id: str,
@@ -286,7 +332,10 @@ async def list_reports(
 ):
     user = await get_current_user(db, session_token, authorization)
     
-    reports = await db.ep_reports.find({"user_id": user["user_id"]}, {"_id": 0}).sort("created_at", -1).to_list(50)
+    # Reports still being analysed (or abandoned partway) stay out of history and analytics
+    reports = await db.ep_reports.find(
+        {"user_id": user["user_id"], "status": {"$nin": ["processing", "failed"]}}, {"_id": 0}
+    ).sort("created_at", -1).to_list(50)
     
     return {"reports": reports}
 
@@ -318,8 +367,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_video_workers():
+    await job_queue.ensure_indexes()
+    await job_queue.reconcile_slots()
+    
+    # Single-container deployments run the worker pool alongside the API;
+    # set EMBEDDED_VIDEO_WORKERS=0 when running `python worker.py` separately
+    embedded = int(os.getenv("EMBEDDED_VIDEO_WORKERS", "2"))
+    if embedded > 0:
+        from worker import start_worker_processes
+        worker_processes.extend(start_worker_processes(embedded))
+        logger.info(f"Started {embedded} embedded video worker processes")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if worker_processes:
+        from worker import stop_worker_processes
+        await asyncio.to_thread(stop_worker_processes, worker_processes)
+        worker_processes.clear()
+    await close_openai_client()
     client.close()
 
 @api_router.get("/learning/daily-tip")
@@ -429,9 +496,6 @@ async def get_module_content(
     user = await get_current_user(db, session_token, authorization)
     profile = await db.user_profiles.find_one({"user_id": user["user_id"]}, {"_id": 0})
     
-    import openai
-    client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    
     role_context = f"{profile.get('role', 'Executive')} at {profile.get('seniority_level', 'Senior')} level" if profile else "executive"
     
     module_prompts = {
@@ -455,11 +519,12 @@ Structure (keep concise):
 
 Keep it actionable and professional. Total: ~200 words."""
     
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=400
-    )
+    async with endpoint_limit("chat"):
+        response = await get_openai_client().chat.completions.create(
+            model="gpt-4o",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=400
+        )
     
     content = response.choices[0].message.content
     
@@ -0,0 +1,74 @@
+"""
+Compute Pool
+Shared ProcessPoolExecutor for CPU-bound librosa/OpenCV work, so long
+analyses never block the event loop that serves job heartbeats and API calls.
+"""
+import os
+import asyncio
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_compute_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("COMPUTE_POOL_WORKERS", "2"))
+        _executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def _warm_up() -> int:
+    # Pay the heavy import cost once per pool process instead of on the first job
+    import numpy  # noqa: F401
+    import librosa  # noqa: F401
+    import cv2  # noqa: F401
+    return os.getpid()
+
+
+async def warm_compute_pool():
+    executor = get_compute_executor()
+    loop = asyncio.get_running_loop()
+    pids = await asyncio.gather(*(
+        loop.run_in_executor(executor, _warm_up) for _ in range(executor._max_workers)
+    ))
+    logger.info(f"Compute pool warmed with {len(set(pids))} processes")
+
+
+def _discard_broken(executor: ProcessPoolExecutor):
+    """Drop a pool whose worker died (e.g. OOM-killed) so the next call starts a fresh one"""
+    global _executor
+    if _executor is executor:
+        _executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_cpu_bound(fn, *args, **kwargs):
+    """Run a picklable module-level function in the compute pool and await its result.
+    Retried once on a fresh pool if a pool process died."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(fn, *args, **kwargs)
+    executor = get_compute_executor()
+    try:
+        return await loop.run_in_executor(executor, call)
+    except BrokenProcessPool:
+        logger.warning("Compute pool process died; restarting the pool and retrying once")
+        _discard_broken(executor)
+        return await loop.run_in_executor(get_compute_executor(), call)
+
+
+def shutdown_compute_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
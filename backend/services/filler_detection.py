@@ -0,0 +1,110 @@
+"""
+Filler Word Detection
+Token trie over per-locale filler lexicons, built once and scanned over the
+Whisper word list in a single pass. PhraseTrie is also used for the other
+phrase lexicons (heuristic scoring). Multi-word fillers ("you know", "I mean")
+match across consecutive words and keep the first word's start and the last
+word's end.
+"""
+import os
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+FILLER_LOCALE = os.getenv("FILLER_LOCALE", "en")
+
+# Only words that are fillers in (nearly) every use; hedges like "kind of" and
+# content words like "como", "ja" or "é" would count ordinary sentences
+FILLER_LEXICONS = {
+    "en": [
+        "um", "umm", "uh", "uhm", "er", "erm", "hmm",
+        "like", "you know", "actually", "basically", "literally",
+        "so", "i mean", "right", "you know what i mean"
+    ],
+    "es": ["eh", "em", "este", "pues", "o sea", "bueno", "entonces", "es decir", "sabes"],
+    "fr": ["euh", "ben", "bah", "genre", "en fait", "du coup", "tu vois", "quoi", "voilà", "bref"],
+    "de": ["äh", "ähm", "öh", "halt", "eigentlich", "sozusagen", "quasi", "weißt du"],
+    "pt": ["hum", "tipo", "então", "né", "assim", "quer dizer", "sabe"],
+}
+
+# Trie key marking the end of a phrase; a sentinel, since punctuation-only words normalize to ""
+_TERMINAL = object()
+_EDGE_PUNCTUATION = re.compile(r"^[^\w']+|[^\w']+$")
+
+
+def normalize_token(word: str) -> str:
+    """Lowercase and strip surrounding punctuation, keeping inner apostrophes"""
+    return _EDGE_PUNCTUATION.sub("", word.replace("’", "'").strip().lower())
+
+
+def normalize_words(words: List[Dict[str, Any]]) -> List[str]:
+    """One normalized token per Whisper word, aligned with `words`"""
+    return [normalize_token(w.get("word", "")) for w in words]
+
+
+class PhraseTrie:
+    """Token trie over a phrase lexicon; matching is one left-to-right pass"""
+    def __init__(self, phrases: List[str]):
+        self.trie: Dict[str, Any] = {}
+        for phrase in phrases:
+            node = self.trie
+            for token in phrase.split():
+                node = node.setdefault(normalize_token(token), {})
+            node[_TERMINAL] = phrase
+
+    def matches(self, tokens: List[str]) -> List[Tuple[int, int, str]]:
+        """(first token, last token, phrase) of the longest match starting at each
+        position, left to right, non-overlapping"""
+        found = []
+        i, n = 0, len(tokens)
+        while i < n:
+            node = self.trie.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+
+            match_end, phrase = -1, None
+            j = i
+            while node is not None:
+                if _TERMINAL in node:
+                    match_end, phrase = j, node[_TERMINAL]
+                j += 1
+                node = node.get(tokens[j]) if j < n else None
+
+            if phrase is None:
+                i += 1
+                continue
+            found.append((i, match_end, phrase))
+            i = match_end + 1
+        return found
+
+    def count(self, tokens: List[str]) -> int:
+        return len(self.matches(tokens))
+
+
+class FillerDetector(PhraseTrie):
+    def find(self, words: List[Dict[str, Any]], tokens: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Fillers with the first word's start and the last word's end as timestamps"""
+        if tokens is None:
+            tokens = normalize_words(words)
+        return [
+            {
+                "timestamp": round(words[first].get("start", 0), 2),
+                "end": round(words[last].get("end", 0), 2),
+                "word": phrase,
+                "type": "filler"
+            }
+            for first, last, phrase in self.matches(tokens)
+        ]
+
+
+_detectors: Dict[str, FillerDetector] = {}
+
+
+def get_filler_detector(locale: str = FILLER_LOCALE) -> FillerDetector:
+    """Detector for `locale` (language code, region ignored), built once per process"""
+    language = (locale or "en").split("-")[0].split("_")[0].lower()
+    if language not in FILLER_LEXICONS:
+        language = "en"
+    if language not in _detectors:
+        _detectors[language] = FillerDetector(FILLER_LEXICONS[language])
+    return _detectors[language]
@@ -0,0 +1,270 @@
+"""
+Heuristic Analysis
+Local, LLM-free gravitas and storytelling estimates for the "fast" analysis
+tier and for degraded operation when the OpenAI API is unavailable. Gravitas
+proxies are lexicon densities per 100 words (hedging, decisive language,
+ownership, reasoning, empathy, vision) matched with the same token tries as
+filler detection; storytelling looks for a narrative opening followed by a
+complication and a resolution. Outputs have the same shape as the LLM
+analyses so scoring and the report don't need to know which produced them.
+"""
+import re
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+from services.filler_detection import PhraseTrie, normalize_token
+from services.transcript_structure import TranscriptStructure, Sentence
+
+HEDGES = [
+    "i think", "i guess", "i feel like", "i suppose", "maybe", "perhaps", "probably", "possibly",
+    "hopefully", "might", "sort of", "kind of", "a little bit", "somewhat", "i'm not sure",
+    "it seems", "more or less", "try to", "i'd say"
+]
+DECISIVE = [
+    "we will", "i will", "we'll", "i'll", "we're going to", "i'm going to", "i decided", "we decided",
+    "i've decided", "my decision", "my recommendation", "i recommend", "we must", "we need to",
+    "i'm confident", "i am confident", "clearly", "definitely", "without question", "committed",
+    "the priority is", "our priority", "bottom line"
+]
+OWNERSHIP = [
+    "i led", "i own", "i owned", "i take responsibility", "my responsibility", "i'm accountable",
+    "i am accountable", "i chose", "i decided", "i built", "i drove", "i made", "i launched",
+    "i delivered", "my team", "i committed", "i learned"
+]
+FIRST_PERSON = ["i", "i'm", "i've", "i'll", "i'd", "me", "my", "mine", "myself"]
+REASONING = [
+    "because", "therefore", "so that", "as a result", "which means", "that's why", "this means",
+    "consequently", "the reason", "given that", "in order to", "thus", "hence"
+]
+EMPATHY = [
+    "our team", "the team", "my team", "customers", "our people", "together", "i understand",
+    "i hear", "listen", "listening", "appreciate", "thank you", "support", "concerns", "trust",
+    "your perspective", "feel", "everyone"
+]
+VISION = [
+    "vision", "future", "strategy", "strategic", "long term", "long-term", "mission", "purpose",
+    "roadmap", "direction", "ambition", "transform", "transformation", "imagine", "opportunity",
+    "next year", "in five years", "over the next", "north star", "goal", "goals"
+]
+
+NARRATIVE = [
+    "i remember", "when i", "when we", "last year", "years ago", "a few years ago", "one day",
+    "there was a time", "back in", "early in my career", "once", "let me tell you", "story",
+    "at the time", "i was", "we were"
+]
+CONFLICT = [
+    "but", "however", "problem", "challenge", "struggled", "struggling", "failed", "failure",
+    "difficult", "crisis", "suddenly", "mistake", "obstacle", "setback", "pushback", "risk",
+    "nobody", "lost", "worried", "until"
+]
+RESOLUTION = [
+    "finally", "eventually", "in the end", "we learned", "i learned", "the lesson", "as a result",
+    "the result", "turned around", "turned out", "solved", "that's when", "today", "since then",
+    "now we", "succeeded", "we won", "it worked"
+]
+
+# Sentences after a narrative opening searched for its complication and resolution
+STORY_WINDOW_SENTENCES = 8
+# Share of the talk a story ideally takes up, for the pacing estimate
+IDEAL_STORY_SHARE = (0.1, 0.4)
+STORY_EXCERPT_WORDS = 60
+SCORE_RANGE = (10, 95)
+
+_NUMBER = re.compile(r"\d")
+
+
+def _tries() -> Dict[str, PhraseTrie]:
+    lexicons = {
+        "hedges": HEDGES, "decisive": DECISIVE, "ownership": OWNERSHIP, "first_person": FIRST_PERSON,
+        "reasoning": REASONING, "empathy": EMPATHY, "vision": VISION,
+        "narrative": NARRATIVE, "conflict": CONFLICT, "resolution": RESOLUTION
+    }
+    return {name: PhraseTrie(phrases) for name, phrases in lexicons.items()}
+
+
+def _clamp(value: float) -> float:
+    low, high = SCORE_RANGE
+    return round(max(low, min(high, value)))
+
+
+def _tokenize(text: str) -> List[str]:
+    tokens = (normalize_token(t) for t in text.split())
+    return [t for t in tokens if t]
+
+
+class HeuristicAnalysisService:
+    """Same analyses as NLPAnalysisService, computed from the transcript alone"""
+    def __init__(self):
+        self.tries = _tries()
+
+    def lexicon_densities(self, tokens: List[str]) -> Dict[str, Any]:
+        """Matches per 100 words for each gravitas lexicon, plus the most frequent phrases"""
+        word_count = max(len(tokens), 1)
+        densities, examples = {}, {}
+        for name in ("hedges", "decisive", "ownership", "first_person", "reasoning", "empathy", "vision"):
+            phrases = [phrase for _, _, phrase in self.tries[name].matches(tokens)]
+            densities[name] = round(len(phrases) * 100 / word_count, 2)
+            examples[name] = [phrase for phrase, _ in Counter(phrases).most_common(3)]
+        return {"per_100_words": densities, "examples": examples, "word_count": len(tokens)}
+
+    def analyze_gravitas(self, structure: TranscriptStructure, communication: Dict[str, Any] = None) -> Dict[str, Any]:
+        tokens = [t for t in structure.tokens if t] or _tokenize(structure.text)
+        lexicon = self.lexicon_densities(tokens)
+        d = lexicon["per_100_words"]
+
+        commanding = _clamp(55 + d["decisive"] * 6 - d["hedges"] * 5 + d["ownership"] * 4)
+        decisiveness = _clamp(50 + d["decisive"] * 8 - d["hedges"] * 6 + d["reasoning"] * 2)
+        poise = self._poise(communication)
+        empathy = _clamp(45 + d["empathy"] * 5)
+        vision = _clamp(45 + d["vision"] * 6 + d["reasoning"] * 3)
+        overall = _clamp((commanding + decisiveness + poise + empathy + vision) / 5)
+
+        return {
+            "commanding_presence": commanding,
+            "decisiveness": decisiveness,
+            "poise_under_pressure": poise,
+            "emotional_intelligence": empathy,
+            "vision_articulation": vision,
+            "overall_gravitas": overall,
+            "key_observations": self._gravitas_observations(lexicon),
+            "lexicon": lexicon
+        }
+
+    def _poise(self, communication: Optional[Dict[str, Any]]) -> float:
+        """Composure from delivery: filler rate and long silences per minute"""
+        if not communication:
+            return 60
+        filler_rate = (communication.get("filler_words") or {}).get("rate_per_minute", 0)
+        minutes = max((communication.get("speaking_rate") or {}).get("duration_minutes", 0), 0.5)
+        long_pauses = sum(1 for p in communication.get("pauses") or [] if p.get("type") == "long")
+        return _clamp(80 - filler_rate * 5 - long_pauses / minutes * 8)
+
+    def _gravitas_observations(self, lexicon: Dict[str, Any]) -> List[str]:
+        d, examples = lexicon["per_100_words"], lexicon["examples"]
+
+        def quoted(name):
+            return ", ".join(f'"{p}"' for p in examples[name]) or "none"
+
+        observations = []
+        if d["hedges"] > d["decisive"]:
+            observations.append(f"Hedging ({d['hedges']} per 100 words, e.g. {quoted('hedges')}) outweighs "
+                                f"decisive language ({d['decisive']} per 100 words)")
+        else:
+            observations.append(f"Decisive language ({d['decisive']} per 100 words, e.g. {quoted('decisive')}) "
+                                f"at least matches hedging ({d['hedges']} per 100 words)")
+        if d["reasoning"] < 0.5:
+            observations.append("Claims are rarely backed with explicit reasoning (because / therefore)")
+        else:
+            observations.append(f"Reasoning connectors appear {d['reasoning']} times per 100 words ({quoted('reasoning')})")
+        if d["ownership"] > 0:
+            observations.append(f"Takes personal ownership ({quoted('ownership')})")
+        else:
+            observations.append("Little first-person ownership of decisions or results")
+        return observations
+
+    def analyze_storytelling(self, structure: TranscriptStructure) -> Dict[str, Any]:
+        sentences = structure.sentences
+        story = self._find_story(sentences)
+        if story is None:
+            return {
+                "has_story": False,
+                "narrative_structure": None,
+                "authenticity": None,
+                "concreteness": None,
+                "pacing": None,
+                "story_excerpt": None,
+                "observations": ["No narrative with a clear complication and outcome was detected"]
+            }
+
+        start, conflict, resolution = story
+        end = (resolution if resolution is not None else conflict) + 1
+        span = sentences[start:end]
+        tokens = [t for s in span for t in _tokenize(s.text)]
+        word_count = max(len(tokens), 1)
+        talk_words = max(sum(s.word_count for s in sentences), 1)
+
+        first_person = self.tries["first_person"].count(tokens) * 100 / word_count
+        # Numbers and mid-sentence capitalized words (names, places) make a story concrete
+        specifics = sum(1 for s in span for i, w in enumerate(s.text.split())
+                        if _NUMBER.search(w) or (i > 0 and w[:1].isupper() and w not in ("I", "I'm", "I've")))
+        share = sum(s.word_count for s in span) / talk_words
+        low, high = IDEAL_STORY_SHARE
+        pacing = 80 if low <= share <= high else 80 - min(abs(share - low), abs(share - high)) * 100
+
+        excerpt_words = " ".join(s.text for s in span).split()
+        excerpt = " ".join(excerpt_words[:STORY_EXCERPT_WORDS]) + ("..." if len(excerpt_words) > STORY_EXCERPT_WORDS else "")
+
+        observations = ["Story opens with a personal or time-anchored setup and introduces a complication"]
+        observations.append("Reaches a clear outcome or lesson" if resolution is not None
+                            else "The complication is never resolved; close the story with its outcome")
+        return {
+            "has_story": True,
+            "narrative_structure": _clamp(60 + (20 if resolution is not None else 0) + min(end - start, 6) * 2),
+            "authenticity": _clamp(50 + first_person * 2),
+            "concreteness": _clamp(45 + specifics * 100 / word_count * 4),
+            "pacing": _clamp(pacing),
+            "story_excerpt": excerpt,
+            "observations": observations
+        }
+
+    def _find_story(self, sentences: List[Sentence]):
+        """(opening, complication, resolution) sentence indexes of the first story, or None"""
+        marks = []
+        for sentence in sentences:
+            tokens = _tokenize(sentence.text)
+            marks.append({name: self.tries[name].count(tokens) > 0 for name in ("narrative", "conflict", "resolution")})
+
+        for start, mark in enumerate(marks):
+            if not mark["narrative"]:
+                continue
+            window = range(start, min(start + STORY_WINDOW_SENTENCES, len(marks)))
+            conflict = next((i for i in window if marks[i]["conflict"]), None)
+            if conflict is None:
+                continue
+            resolution = next((i for i in window if i > conflict and marks[i]["resolution"]), None)
+            return start, conflict, resolution
+        return None
+
+    def generate_coaching_tips(self, all_metrics: Dict[str, Any]) -> List[str]:
+        """Rule-based tips from the largest gaps in the measured metrics"""
+        communication = all_metrics.get("communication") or {}
+        gravitas = all_metrics.get("gravitas") or {}
+        storytelling = all_metrics.get("storytelling") or {}
+        tips = []
+
+        wpm = (communication.get("speaking_rate") or {}).get("wpm", 0)
+        if wpm > 170:
+            tips.append(f"Slow down from {wpm:.0f} to around 150 words per minute so key points land")
+        elif 0 < wpm < 130:
+            tips.append(f"Lift your pace from {wpm:.0f} towards 140-160 words per minute to sound more energised")
+
+        fillers = communication.get("filler_words") or {}
+        if fillers.get("rate_per_minute", 0) > 2:
+            common = [word for word, _ in Counter(f["word"] for f in fillers.get("fillers", [])).most_common(2)]
+            tips.append(f"Replace fillers ({', '.join(common) or 'um, uh'}) with a short silent pause")
+
+        lexicon = (gravitas.get("lexicon") or {}).get("per_100_words") or {}
+        if lexicon.get("hedges", 0) > lexicon.get("decisive", 0):
+            tips.append("Swap hedges like \"I think\" and \"maybe\" for direct statements of your position")
+        if lexicon and lexicon.get("reasoning", 0) < 0.5:
+            tips.append("Back each recommendation with its reason: \"because...\", \"therefore...\"")
+        if lexicon and lexicon.get("ownership", 0) == 0:
+            tips.append("Own outcomes in the first person: \"I decided\", \"I led\"")
+
+        if not storytelling.get("has_story"):
+            tips.append("Add a short story with a clear challenge and outcome to make your message memorable")
+
+        if any(p.get("type") == "long" for p in communication.get("pauses") or []):
+            tips.append("Keep pauses under two seconds; longer silences read as lost thread")
+
+        clarity = communication.get("sentence_clarity") or {}
+        if clarity.get("long_sentence_ratio", 0) > 0.2:
+            tips.append("Break long sentences into one idea each")
+
+        if len(tips) < 3:
+            tips.extend([
+                "Open with your main recommendation before the supporting detail",
+                "Pause deliberately before and after your most important point",
+                "Close by restating the one thing you want the audience to remember"
+            ][:3 - len(tips)])
+        return tips[:7]
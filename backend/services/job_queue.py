@@ -0,0 +1,299 @@
+"""
+Video Job Queue
+Durable queue for video analysis jobs backed by the video_jobs collection.
+
+Jobs are claimed atomically with find_one_and_update and held under a lease
+that the owning worker renews with heartbeats. A job whose lease expires
+(worker crashed or was killed) becomes claimable again, so nothing stuck in
+pending/transcribing survives a restart.
+
+Admission caps are enforced atomically with slot counters in
+video_queue_slots (one global document, one per user): a slot is taken with
+a guarded $inc before the job is inserted and returned when the job
+completes or fails for good. reconcile_slots() recomputes the counters from
+video_jobs at startup to repair drift after a crash between the two writes.
+"""
+import os
+import uuid
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Optional, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, ASCENDING
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Statuses written by VideoProcessorService while a job is running
+ACTIVE_STATUSES = ["transcribing", "audio_analysis", "video_analysis", "nlp_analysis", "scoring"]
+QUEUED_STATUSES = ["pending"] + ACTIVE_STATUSES
+GLOBAL_SLOT = "global"
+# "full": Whisper plus GPT-4o vision and NLP; "fast": Whisper plus local transcript heuristics
+ANALYSIS_TIERS = ("fast", "full")
+
+
+class QueueFullError(Exception):
+    """Raised when admission control rejects a new job"""
+    def __init__(self, message: str, retry_after: int = 30):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class VideoJobQueue:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.lease_seconds = int(os.getenv("VIDEO_JOB_LEASE_SECONDS", "120"))
+        self.max_attempts = int(os.getenv("VIDEO_JOB_MAX_ATTEMPTS", "3"))
+        self.backoff_base_seconds = int(os.getenv("VIDEO_JOB_BACKOFF_SECONDS", "30"))
+        self.backoff_max_seconds = int(os.getenv("VIDEO_JOB_BACKOFF_MAX_SECONDS", "600"))
+        self.max_pending = int(os.getenv("VIDEO_QUEUE_MAX_PENDING", "50"))
+        self.max_pending_per_user = int(os.getenv("VIDEO_QUEUE_MAX_PENDING_PER_USER", "3"))
+
+    async def ensure_indexes(self):
+        """Create the indexes used by claim() and admission control"""
+        await self.db.video_jobs.create_index("job_id")
+        await self.db.video_jobs.create_index([("status", ASCENDING), ("available_at", ASCENDING)])
+        await self.db.video_jobs.create_index([("user_id", ASCENDING), ("status", ASCENDING)])
+        await self.db.video_jobs.create_index("refines_job_id", sparse=True)
+
+    async def reconcile_slots(self):
+        """Reset the admission counters to the number of queued jobs"""
+        per_user = await self.db.video_jobs.aggregate([
+            {"$match": {"status": {"$in": QUEUED_STATUSES}}},
+            {"$group": {"_id": "$user_id", "count": {"$sum": 1}}}
+        ]).to_list(None)
+        await self.db.video_queue_slots.update_many({"_id": {"$ne": GLOBAL_SLOT}}, {"$set": {"count": 0}})
+        for row in per_user:
+            await self.db.video_queue_slots.update_one(
+                {"_id": _user_slot(row["_id"])}, {"$set": {"count": row["count"]}}, upsert=True
+            )
+        await self.db.video_queue_slots.update_one(
+            {"_id": GLOBAL_SLOT}, {"$set": {"count": sum(row["count"] for row in per_user)}}, upsert=True
+        )
+
+    async def _acquire_slot(self, slot: str, cap: Optional[int] = None) -> bool:
+        """Increment a slot counter, only while it is below `cap` (no cap: always)"""
+        query = {"_id": slot}
+        if cap is not None:
+            query["count"] = {"$lt": cap}
+        try:
+            await self.db.video_queue_slots.update_one(query, {"$inc": {"count": 1}}, upsert=True)
+        except DuplicateKeyError:
+            # The counter exists but is at the cap, so the upsert collided with it
+            return False
+        return True
+
+    async def _release_slots(self, user_id: str):
+        for slot in (GLOBAL_SLOT, _user_slot(user_id)):
+            await self.db.video_queue_slots.update_one(
+                {"_id": slot, "count": {"$gt": 0}}, {"$inc": {"count": -1}}
+            )
+
+    async def _admit(self, user_id: str):
+        """Take a global and a per-user slot under the caps, or raise QueueFullError"""
+        if not await self._acquire_slot(GLOBAL_SLOT, self.max_pending):
+            raise QueueFullError("Video processing is at capacity. Please try again shortly.")
+
+        if not await self._acquire_slot(_user_slot(user_id), self.max_pending_per_user):
+            await self.db.video_queue_slots.update_one({"_id": GLOBAL_SLOT}, {"$inc": {"count": -1}})
+            raise QueueFullError(
+                f"You already have {self.max_pending_per_user} videos processing. Please wait for one to finish.",
+                retry_after=60
+            )
+
+    async def enqueue(self, job_doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Admit a new job into the queue, or raise QueueFullError"""
+        user_id = job_doc["user_id"]
+        await self._admit(user_id)
+        try:
+            return await self._insert(job_doc)
+        except Exception:
+            await self._release_slots(user_id)
+            raise
+
+    async def _insert(self, job_doc: Dict[str, Any]) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc).isoformat()
+        job_doc.update({
+            "attempts": 0,
+            "available_at": now,
+            "lease_owner": None,
+            "lease_expires_at": None
+        })
+        await self.db.video_jobs.insert_one(job_doc)
+        job_doc.pop("_id", None)
+        return job_doc
+
+    async def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest runnable job, including ones whose lease expired"""
+        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
+
+        return await self.db.video_jobs.find_one_and_update(
+            {
+                "status": {"$in": QUEUED_STATUSES},
+                "$and": [
+                    {"$or": [{"available_at": {"$lte": now_iso}}, {"available_at": None}]},
+                    # A missing lease on an active job means it was orphaned by a crash
+                    {"$or": [{"lease_expires_at": {"$lt": now_iso}}, {"lease_expires_at": None}]}
+                ]
+            },
+            {
+                "$set": {
+                    "lease_owner": worker_id,
+                    "lease_expires_at": (now + timedelta(seconds=self.lease_seconds)).isoformat(),
+                    "claimed_at": now_iso,
+                    "updated_at": now_iso
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", ASCENDING)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease; returns False if another worker has taken the job over"""
+        lease_expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)
+        result = await self.db.video_jobs.update_one(
+            {"job_id": job_id, "lease_owner": worker_id},
+            {"$set": {"lease_expires_at": lease_expires_at.isoformat()}}
+        )
+        return result.matched_count > 0
+
+    async def complete(self, job_id: str, worker_id: str):
+        job = await self.db.video_jobs.find_one_and_update(
+            {"job_id": job_id, "lease_owner": worker_id},
+            {"$set": {"lease_owner": None, "lease_expires_at": None}},
+            projection={"_id": 0, "user_id": 1}
+        )
+        if job:
+            await self._release_slots(job["user_id"])
+
+    async def release(self, job_id: str, worker_id: str):
+        """Hand a job back without counting the attempt (e.g. worker shutting down)"""
+        await self.db.video_jobs.update_one(
+            {"job_id": job_id, "lease_owner": worker_id},
+            {
+                "$set": {
+                    "status": "pending",
+                    "current_step": "Waiting for an available worker...",
+                    "available_at": datetime.now(timezone.utc).isoformat(),
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                    "updated_at": datetime.now(timezone.utc).isoformat()
+                },
+                "$inc": {"attempts": -1}
+            }
+        )
+
+    async def requeue_failed(self, job_id: str, user_id: str) -> bool:
+        """Put a failed job back in the queue with a fresh retry budget; subject to the
+        same admission caps as new jobs (raises QueueFullError)"""
+        await self._admit(user_id)
+        now = datetime.now(timezone.utc).isoformat()
+        result = await self.db.video_jobs.update_one(
+            {"job_id": job_id, "user_id": user_id, "status": "failed"},
+            {"$set": {
+                "status": "pending",
+                "current_step": "Queued to resume...",
+                "attempts": 0,
+                "available_at": now,
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "error": None,
+                "updated_at": now
+            }}
+        )
+        if result.modified_count == 0:
+            await self._release_slots(user_id)
+            return False
+        # Reopen its report so clients resume polling for the remaining sections
+        await self.db.ep_reports.update_one(
+            {"job_id": job_id, "status": "failed"},
+            {"$set": {"status": "processing", "updated_at": now}}
+        )
+        await self.db.ep_reports.update_one(
+            {"refinement_job_id": job_id, "refinement_status": "failed"},
+            {"$set": {"refinement_status": "processing", "updated_at": now}}
+        )
+        return True
+
+    async def enqueue_refinement(self, job: Dict[str, Any], report_id: str) -> str:
+        """Queue the full-tier analysis that refines a fast-tier report in place.
+        Part of already admitted work, so it skips admission control."""
+        # A retried fast job may already have queued its refinement
+        existing = await self.db.video_jobs.find_one({"refines_job_id": job["job_id"]}, {"_id": 0, "job_id": 1})
+        now = datetime.now(timezone.utc).isoformat()
+        refinement_job_id = existing["job_id"] if existing else f"job_{uuid.uuid4().hex}"
+        if not existing:
+            await self._insert({
+                "job_id": refinement_job_id,
+                "user_id": job["user_id"],
+                "video_id": job["video_id"],
+                "tier": "full",
+                "refine": False,
+                "report_id": report_id,
+                "refines_job_id": job["job_id"],
+                "status": "pending",
+                "progress": 0.0,
+                "current_step": "Queued for full analysis...",
+                "created_at": now,
+                "updated_at": now
+            })
+            await self._acquire_slot(GLOBAL_SLOT)
+            await self._acquire_slot(_user_slot(job["user_id"]))
+        await self.db.video_jobs.update_one(
+            {"job_id": job["job_id"]},
+            {"$set": {"refinement_job_id": refinement_job_id}}
+        )
+        return refinement_job_id
+
+    async def fail(self, job: Dict[str, Any], worker_id: str, error: str):
+        """Schedule a retry with exponential backoff, or mark the job failed for good"""
+        attempts = job.get("attempts", 1)
+        now = datetime.now(timezone.utc)
+
+        if attempts < self.max_attempts:
+            delay = min(self.backoff_base_seconds * (2 ** (attempts - 1)), self.backoff_max_seconds)
+            update = {
+                "status": "pending",
+                "current_step": f"Retrying in {delay}s (attempt {attempts + 1} of {self.max_attempts})...",
+                "available_at": (now + timedelta(seconds=delay)).isoformat(),
+                "last_error": error
+            }
+            logger.warning(f"Job {job['job_id']} failed (attempt {attempts}), retrying in {delay}s: {error}")
+        else:
+            update = {
+                "status": "failed",
+                "error": error,
+                "last_error": error
+            }
+            logger.error(f"Job {job['job_id']} failed permanently after {attempts} attempts: {error}")
+
+        update.update({
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "updated_at": now.isoformat()
+        })
+        result = await self.db.video_jobs.update_one(
+            {"job_id": job["job_id"], "lease_owner": worker_id},
+            {"$set": update}
+        )
+        if update["status"] == "failed" and result.matched_count:
+            await self._release_slots(job["user_id"])
+            await self._fail_report(job["job_id"], update["updated_at"])
+
+    async def _fail_report(self, job_id: str, now: str):
+        """Close out the partial report a permanently failed job was publishing to"""
+        await self.db.ep_reports.update_one(
+            {"job_id": job_id, "status": "processing"},
+            {"$set": {"status": "failed", "updated_at": now}}
+        )
+        await self.db.ep_reports.update_one(
+            {"refinement_job_id": job_id, "refinement_status": "processing"},
+            {"$set": {"refinement_status": "failed", "updated_at": now}}
+        )
+
+
+def _user_slot(user_id: str) -> str:
+    return f"user:{user_id}"
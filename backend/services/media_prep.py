@@ -0,0 +1,150 @@
+"""
+Media Preparation Service
+Probes an uploaded video once and decodes it once, emitting both the 16 kHz
+mono PCM used for transcription/audio analysis and the downscaled JPEG frames
+used for vision analysis.
+"""
+import os
+import json
+import shutil
+import asyncio
+import tempfile
+import subprocess
+from typing import Dict, Any, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+FFMPEG_PATH = '/usr/bin/ffmpeg'
+FFPROBE_PATH = '/usr/bin/ffprobe'
+
+FFPROBE_ARGS = ['-v', 'error', '-print_format', 'json', '-show_format', '-show_streams']
+
+
+def summarize_probe(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce ffprobe JSON output to the fields the pipeline uses"""
+    fmt = raw.get("format", {})
+    streams = raw.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+    fps = None
+    if video and video.get("avg_frame_rate") and video["avg_frame_rate"] != "0/0":
+        num, _, den = video["avg_frame_rate"].partition("/")
+        try:
+            fps = float(num) / float(den or 1)
+        except (ValueError, ZeroDivisionError):
+            fps = None
+
+    try:
+        duration = float(fmt.get("duration"))
+    except (TypeError, ValueError):
+        duration = None
+
+    return {
+        "format_name": fmt.get("format_name", "unknown"),
+        "duration": duration,
+        "has_video": video is not None,
+        "has_audio": audio is not None,
+        "video_codec": video.get("codec_name") if video else None,
+        "audio_codec": audio.get("codec_name") if audio else None,
+        "width": video.get("width") if video else None,
+        "height": video.get("height") if video else None,
+        "fps": fps
+    }
+
+
+def probe_media_sync(path: str) -> Dict[str, Any]:
+    result = subprocess.run(
+        [FFPROBE_PATH, *FFPROBE_ARGS, path],
+        capture_output=True, text=True, timeout=10
+    )
+    return summarize_probe(json.loads(result.stdout or "{}"))
+
+
+class MediaPrepService:
+    def __init__(self, frame_fps: int = 2, frame_height: int = 360):
+        self.frame_fps = frame_fps
+        self.frame_height = frame_height
+
+    async def probe(self, video_path: str) -> Dict[str, Any]:
+        """Single ffprobe call with JSON output"""
+        process = await asyncio.create_subprocess_exec(
+            FFPROBE_PATH, *FFPROBE_ARGS, video_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"ffprobe failed: {stderr.decode()}")
+        return summarize_probe(json.loads(stdout.decode() or "{}"))
+
+    async def get_probe(self, db: AsyncIOMotorDatabase, video_id: str, video_path: str) -> Dict[str, Any]:
+        """Return the probe cached on video_metadata, probing (and caching) on first use"""
+        metadata = await db.video_metadata.find_one({"video_id": video_id}, {"_id": 0, "probe": 1})
+        if metadata and metadata.get("probe"):
+            return metadata["probe"]
+
+        probe = await self.probe(video_path)
+        await db.video_metadata.update_one(
+            {"video_id": video_id},
+            {"$set": {"probe": probe, "duration": probe.get("duration")}}
+        )
+        return probe
+
+    async def prepare(self, video_path: str, probe: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Decode the video once, writing PCM audio and sampled frames into a work directory.
+
+        Returns None if ffmpeg fails so callers can fall back to the per-stage extractors.
+        """
+        work_dir = tempfile.mkdtemp(prefix="media_prep_")
+        audio_path = os.path.join(work_dir, "audio.wav")
+        frames_dir = os.path.join(work_dir, "frames")
+        os.makedirs(frames_dir)
+
+        command = [FFMPEG_PATH, '-v', 'error', '-i', video_path]
+        if probe.get("has_audio"):
+            command.extend([
+                '-map', '0:a:0', '-vn',
+                '-acodec', 'pcm_s16le', '-ar', '16000', '-ac', '1',
+                audio_path
+            ])
+        if probe.get("has_video"):
+            command.extend([
+                '-map', '0:v:0', '-an',
+                '-vf', f"fps={self.frame_fps},scale=-2:'min({self.frame_height},ih)'",
+                '-q:v', '5',
+                os.path.join(frames_dir, 'frame_%05d.jpg')
+            ])
+        command.append('-y')
+
+        if not (probe.get("has_audio") or probe.get("has_video")):
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return None
+
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+
+        if process.returncode != 0:
+            print(f"Single-pass media prep failed: {stderr.decode()}")
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return None
+
+        frame_paths = sorted(
+            os.path.join(frames_dir, name) for name in os.listdir(frames_dir) if name.endswith(".jpg")
+        )
+        has_audio = os.path.exists(audio_path) and os.path.getsize(audio_path) >= 1000
+
+        return {
+            "work_dir": work_dir,
+            "audio_path": audio_path if has_audio else None,
+            "frame_paths": frame_paths,
+            "frame_fps": self.frame_fps,
+            "probe": probe
+        }
+
+    def cleanup(self, prepared: Optional[Dict[str, Any]]):
+        if prepared:
+            shutil.rmtree(prepared["work_dir"], ignore_errors=True)
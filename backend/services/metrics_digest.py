@@ -0,0 +1,171 @@
+"""
+Metrics Digest
+Reduces the analysis metrics to the aggregates a coaching prompt needs
+(rates, counts, distance from benchmarks, the few longest sentences) and
+trims it to a token budget, so prompt size no longer grows with video length.
+"""
+import os
+import json
+from collections import Counter
+from typing import Dict, Any, List
+
+from utils.token_count import count_tokens
+
+DIGEST_MAX_TOKENS = int(os.getenv("METRICS_DIGEST_MAX_TOKENS", "500"))
+DIGEST_TOP_SENTENCES = 3
+DIGEST_SENTENCE_WORDS = 30
+
+# Same benchmarks the analysis services report to the user
+IDEAL_WPM = (140, 160)
+MAX_FILLERS_PER_MINUTE = 2.0
+IDEAL_PITCH_VARIABILITY_HZ = (20, 40)
+
+
+def _outside(value: float, bounds: tuple) -> float:
+    """Signed distance from the ideal range; 0 inside it"""
+    low, high = bounds
+    if value < low:
+        return round(value - low, 1)
+    if value > high:
+        return round(value - high, 1)
+    return 0.0
+
+
+def _communication_digest(communication: Dict[str, Any], top_k: int) -> Dict[str, Any]:
+    digest = {}
+
+    rate = communication.get("speaking_rate") or {}
+    if "wpm" in rate:
+        digest["speaking_rate"] = {
+            "wpm": rate["wpm"],
+            "vs_ideal_140_160": _outside(rate["wpm"], IDEAL_WPM),
+            "word_count": rate.get("word_count")
+        }
+        for key in ("speaking_wpm", "speaking_ratio"):
+            if key in rate:
+                digest["speaking_rate"][key] = rate[key]
+
+    fillers = communication.get("filler_words") or {}
+    if fillers:
+        counts = Counter(f["word"] for f in fillers.get("fillers", []))
+        digest["fillers"] = {
+            "count": fillers.get("count", 0),
+            "rate_per_minute": fillers.get("rate_per_minute", 0),
+            "vs_max_2_per_minute": round(fillers.get("rate_per_minute", 0) - MAX_FILLERS_PER_MINUTE, 2),
+            "most_common": counts.most_common(3)
+        }
+
+    pauses = communication.get("pauses")
+    if pauses is not None:
+        durations = [p["duration"] for p in pauses]
+        by_type = Counter(p["type"] for p in pauses)
+        digest["pauses"] = {
+            "count": len(pauses),
+            "strategic": by_type.get("strategic", 0),
+            "long": by_type.get("long", 0),
+            "mean_seconds": round(sum(durations) / len(durations), 2) if durations else 0
+        }
+
+    vocal = communication.get("vocal_metrics") or {}
+    if "pitch_variability" in vocal:
+        digest["vocal"] = {
+            "pitch_mean_hz": vocal.get("pitch_mean_hz"),
+            "pitch_variability": vocal["pitch_variability"],
+            "vs_ideal_20_40": _outside(vocal["pitch_variability"], IDEAL_PITCH_VARIABILITY_HZ),
+            "loudness_stability": vocal.get("loudness_stability")
+        }
+
+    clarity = communication.get("sentence_clarity") or {}
+    if clarity:
+        digest["sentences"] = {
+            "count": clarity.get("sentence_count", 0),
+            "average_words": clarity.get("average_words", 0),
+            "long_ratio": clarity.get("long_sentence_ratio", 0)
+        }
+    digest["longest_sentences"] = [
+        {"word_count": s["word_count"], "text": " ".join(s["sentence"].split()[:DIGEST_SENTENCE_WORDS])}
+        for s in clarity.get("longest_sentences", [])[:top_k] if s.get("clarity_rating") != "concise"
+    ]
+    return digest
+
+
+def build_metrics_digest(all_metrics: Dict[str, Any], top_k: int = DIGEST_TOP_SENTENCES) -> Dict[str, Any]:
+    """Aggregate view of all_metrics; any section may be missing"""
+    digest: Dict[str, Any] = {}
+
+    scores = all_metrics.get("scores")
+    if scores:
+        digest["scores"] = scores
+        ranked = sorted((k for k, v in scores.items() if k != "overall" and v is not None), key=lambda k: scores[k])
+        digest["weakest_areas"] = ranked[:2]
+        digest["strongest_area"] = ranked[-1] if ranked else None
+
+    if all_metrics.get("communication"):
+        digest.update(_communication_digest(all_metrics["communication"], top_k))
+
+    presence = all_metrics.get("presence")
+    if presence:
+        digest["presence"] = {k: v for k, v in presence.items() if k != "error"}
+
+    gravitas = all_metrics.get("gravitas")
+    if gravitas:
+        digest["gravitas"] = {k: v for k, v in gravitas.items() if isinstance(v, (int, float)) and not isinstance(v, bool)}
+        digest["gravitas"]["observations"] = list(gravitas.get("key_observations") or [])[:3]
+
+    storytelling = all_metrics.get("storytelling")
+    if storytelling:
+        digest["storytelling"] = {
+            k: storytelling.get(k)
+            for k in ("has_story", "narrative_structure", "authenticity", "concreteness", "pacing")
+        }
+        digest["storytelling"]["observations"] = list(storytelling.get("observations") or [])[:2]
+
+    return digest
+
+
+def _render(digest: Dict[str, Any]) -> str:
+    return json.dumps(digest, separators=(',', ':'), ensure_ascii=False)
+
+
+def _trim_steps(digest: Dict[str, Any]) -> List:
+    """Reductions applied in order until the digest fits, least useful detail first"""
+    def drop_sentence():
+        if digest.get("longest_sentences"):
+            digest["longest_sentences"].pop()
+            return True
+        return False
+
+    def shorten_observations():
+        changed = False
+        for section in ("gravitas", "storytelling"):
+            observations = digest.get(section, {}).get("observations")
+            if observations and len(observations) > 1:
+                digest[section]["observations"] = observations[:1]
+                changed = True
+        return changed
+
+    def drop_observations():
+        changed = False
+        for section in ("gravitas", "storytelling"):
+            if digest.get(section, {}).pop("observations", None) is not None:
+                changed = True
+        return changed
+
+    def drop_sections():
+        for key in ("gravitas", "storytelling", "presence", "vocal", "pauses"):
+            if key in digest:
+                del digest[key]
+                return True
+        return False
+
+    return [drop_sentence, shorten_observations, drop_observations, drop_sections]
+
+
+def render_metrics_digest(all_metrics: Dict[str, Any], max_tokens: int = DIGEST_MAX_TOKENS) -> str:
+    """Compact JSON digest of all_metrics that fits within max_tokens where possible"""
+    digest = build_metrics_digest(all_metrics)
+    text = _render(digest)
+    for step in _trim_steps(digest):
+        while count_tokens(text) > max_tokens and step():
+            text = _render(digest)
+    return text
@@ -1,20 +1,23 @@
 import os
-import asyncio
-import openai
 from typing import Dict, Any
-import json
 from dotenv import load_dotenv
 from pathlib import Path
+from openai import AsyncOpenAI
+from services.openai_client import get_openai_client
+from services.metrics_digest import render_metrics_digest
+from services.structured_output import request_structured
+from models.video import GravitasMetrics, StorytellingMetrics, CoachingTips, CombinedNLPAnalysis
 
 ROOT_DIR = Path(__file__).parent.parent
 load_dotenv(ROOT_DIR / '.env')
 
+# combined: one structured call for gravitas + storytelling + tips; separate: the original three calls
+NLP_ANALYSIS_MODE = os.getenv("NLP_ANALYSIS_MODE", "combined")
+
+
 class NLPAnalysisService:
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-        self.client = openai.OpenAI(api_key=api_key)
+    def __init__(self, client: AsyncOpenAI = None):
+        self.client = client or get_openai_client()
     
     async def analyze_gravitas(self, transcript: str, user_profile: Dict[str, Any] = None) -> Dict[str, Any]:
         profile_context = ""
@@ -33,37 +36,14 @@ class NLPAnalysisService:
 4. **Emotional Intelligence**: Empathy markers, stakeholder framing, ownership, respectful language
 5. **Vision Articulation**: Clear why/what/how, outcomes, strategic alignment
 
-Provide JSON response:
-{{
-  "commanding_presence": float,
-  "decisiveness": float,
-  "poise_under_pressure": float,
-  "emotional_intelligence": float,
-  "vision_articulation": float,
-  "overall_gravitas": float,
-  "key_observations": ["point 1", "point 2"]
-}}"""
+Also give overall_gravitas (0-100) and 2-4 key_observations."""
         
-        try:
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=600
-            )
-            
-            result_text = response.choices[0].message.content
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            
-            if json_start != -1 and json_end != 0:
-                result = json.loads(result_text[json_start:json_end])
-            else:
-                result = self._default_gravitas()
-            
-            return result
-        except Exception as e:
-            return self._default_gravitas(error=str(e))
+        result = await request_structured(
+            self.client, GravitasMetrics,
+            [{"role": "user", "content": prompt}],
+            max_tokens=600
+        )
+        return result.model_dump()
     
     async def analyze_storytelling(self, transcript: str, user_profile: Dict[str, Any] = None) -> Dict[str, Any]:
         profile_context = ""
@@ -82,86 +62,83 @@ Provide JSON response:
    - Authenticity: First-person lessons, reflections, responsibility
    - Concreteness: Specific details and examples
    - Pacing: Story portion as % of total
-3. If NO story detected, return has_story: false
-
-JSON response:
-{{
-  "has_story": bool,
-  "narrative_structure": float or null,
-  "authenticity": float or null,
-  "concreteness": float or null,
-  "pacing": float or null,
-  "story_excerpt": "brief excerpt" or null,
-  "observations": ["point 1", "point 2"]
-}}"""
+3. If NO story detected, return has_story: false with null scores and excerpt
+4. Give 1-3 observations either way"""
         
-        try:
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=500
-            )
-            
-            result_text = response.choices[0].message.content
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            
-            if json_start != -1 and json_end != 0:
-                result = json.loads(result_text[json_start:json_end])
-            else:
-                result = {"has_story": False}
-            
-            return result
-        except Exception as e:
-            return {"has_story": False, "error": str(e)}
+        result = await request_structured(
+            self.client, StorytellingMetrics,
+            [{"role": "user", "content": prompt}],
+            max_tokens=500
+        )
+        return result.model_dump()
+    
+    async def analyze_combined(self, transcript: str, delivery_metrics: Dict[str, Any],
+                               user_profile: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Gravitas, storytelling and coaching tips from one schema-constrained call.
+        `delivery_metrics` holds the communication and presence sections of all_metrics.
+        
+        Raises on any API or validation failure so the caller can fall back to
+        the separate calls.
+        """
+        profile_context = ""
+        if user_profile:
+            profile_context = f"\n\n**Speaker Profile:**\n- Role: {user_profile.get('role', 'Executive')}\n- Seniority: {user_profile.get('seniority_level', 'Senior')}\n- Experience: {user_profile.get('years_experience', 5)} years\n- Industry: {user_profile.get('industry', 'Technology')}\n\nIMPORTANT: Evaluate this speaker against the standards expected for their specific role and seniority level.\n"
+        
+        prompt = f"""Analyze this executive's talk for executive presence.{profile_context}
+
+**Transcript:**
+{transcript}
+
+**Measured Delivery Metrics:**
+{render_metrics_digest(delivery_metrics)}
+
+**1. Gravitas** (score each 0-100):
+- Commanding Presence: Directness, confident language, reduced hedging
+- Decisiveness: Clear decisions, reasoning with 'because/therefore', closure statements
+- Poise Under Pressure: Calm framing, problem decomposition when discussing challenges
+- Emotional Intelligence: Empathy markers, stakeholder framing, ownership, respectful language
+- Vision Articulation: Clear why/what/how, outcomes, strategic alignment
+Include overall_gravitas and 2-4 key_observations.
+
+**2. Storytelling**: Does the talk contain a story with setup → conflict → resolution?
+If yes, score narrative_structure, authenticity, concreteness and pacing (0-100) and quote a brief story_excerpt.
+If no, set has_story to false and the scores and excerpt to null.
+
+**3. Coaching Tips**: 5-7 tips that are specific, actionable, supportive, mapped to the weakest areas
+above (including the delivery metrics), with 1-2 positive reinforcements."""
+        
+        result = await request_structured(
+            self.client, CombinedNLPAnalysis,
+            [{"role": "user", "content": prompt}],
+            max_tokens=1200
+        )
+        result = result.model_dump()
+        result["coaching_tips"] = result["coaching_tips"][:7]
+        return result
     
     async def generate_coaching_tips(self, all_metrics: Dict[str, Any]) -> list:
-        prompt = f"""Based on these EP metrics, provide 5-7 actionable coaching tips:
+        try:
+            prompt = f"""Based on these EP metrics, provide 5-7 actionable coaching tips:
 
 **Metrics Summary:**
-{json.dumps(all_metrics, indent=2)}
+{render_metrics_digest(all_metrics)}
 
 Generate coaching tips that are:
 - Specific and actionable
 - Supportive and constructive
 - Mapped to weak areas
-- Include 1-2 positive reinforcements
-
-Return JSON array: ["tip 1", "tip 2", ...]"""
-        
-        try:
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
+- Include 1-2 positive reinforcements"""
+            
+            result = await request_structured(
+                self.client, CoachingTips,
+                [{"role": "user", "content": prompt}],
                 max_tokens=400
             )
-            
-            result_text = response.choices[0].message.content
-            json_start = result_text.find('[')
-            json_end = result_text.rfind(']') + 1
-            
-            if json_start != -1 and json_end != 0:
-                tips = json.loads(result_text[json_start:json_end])
-                return tips[:7]
-            else:
-                return self._default_tips()
+            return result.tips[:7]
         except Exception as e:
+            print(f"Coaching tips unavailable, using defaults: {e}")
             return self._default_tips()
     
-    def _default_gravitas(self, error=None):
-        return {
-            "commanding_presence": 60.0,
-            "decisiveness": 60.0,
-            "poise_under_pressure": 60.0,
-            "emotional_intelligence": 60.0,
-            "vision_articulation": 60.0,
-            "overall_gravitas": 60.0,
-            "key_observations": ["Analysis unavailable"],
-            "error": error
-        }
-    
     def _default_tips(self):
         return [
             "Practice strategic pauses before key points",
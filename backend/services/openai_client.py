@@ -0,0 +1,94 @@
+"""
+Shared OpenAI Client
+One AsyncOpenAI client per process, backed by a pooled httpx connection pool
+(HTTP/2 when the h2 package is installed), with per-endpoint concurrency
+limits and a single timeout/retry policy for every service that calls OpenAI.
+"""
+import os
+import asyncio
+import logging
+import importlib.util
+from typing import Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "120"))
+OPENAI_CONNECT_TIMEOUT_SECONDS = float(os.getenv("OPENAI_CONNECT_TIMEOUT_SECONDS", "10"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "32"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "16"))
+# auto | on | off; auto enables HTTP/2 only if h2 is importable, on fails without it
+OPENAI_HTTP2 = os.getenv("OPENAI_HTTP2", "auto")
+
+# Max in-flight requests per endpoint in this process
+ENDPOINT_CONCURRENCY = {
+    "chat": int(os.getenv("OPENAI_CHAT_CONCURRENCY", "8")),
+    "vision": int(os.getenv("OPENAI_VISION_CONCURRENCY", "4")),
+    "transcription": int(os.getenv("OPENAI_TRANSCRIPTION_CONCURRENCY", "4")),
+}
+
+_client: Optional[AsyncOpenAI] = None
+_limits: Dict[str, asyncio.Semaphore] = {}
+
+
+def http2_enabled() -> bool:
+    """auto: HTTP/2 when h2 is installed; on: require it; off: HTTP/1.1 only"""
+    if OPENAI_HTTP2 == "off":
+        return False
+    available = importlib.util.find_spec("h2") is not None
+    if OPENAI_HTTP2 == "on" and not available:
+        raise ValueError("OPENAI_HTTP2=on requires the h2 package (pip install h2)")
+    if OPENAI_HTTP2 not in ("auto", "on"):
+        raise ValueError(f"OPENAI_HTTP2 must be auto, on or off, not {OPENAI_HTTP2!r}")
+    return available
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """The process-wide client; created on first use"""
+    global _client
+    if _client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables")
+
+        timeout = httpx.Timeout(OPENAI_TIMEOUT_SECONDS, connect=OPENAI_CONNECT_TIMEOUT_SECONDS)
+        http_client = httpx.AsyncClient(
+            http2=http2_enabled(),
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+                keepalive_expiry=60
+            )
+        )
+        _client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=http_client,
+            timeout=timeout,
+            max_retries=OPENAI_MAX_RETRIES
+        )
+        logger.info(f"OpenAI client ready (http2={http2_enabled()}, max_connections={OPENAI_MAX_CONNECTIONS})")
+    return _client
+
+
+def endpoint_limit(endpoint: str) -> asyncio.Semaphore:
+    """Semaphore bounding concurrent requests to `endpoint` (chat, vision, transcription)"""
+    if endpoint not in _limits:
+        _limits[endpoint] = asyncio.Semaphore(ENDPOINT_CONCURRENCY.get(endpoint, ENDPOINT_CONCURRENCY["chat"]))
+    return _limits[endpoint]
+
+
+async def close_openai_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+    _limits.clear()
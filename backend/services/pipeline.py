@@ -0,0 +1,83 @@
+"""
+Pipeline Stage Graph
+Runs analysis stages as soon as their dependencies have finished, so
+independent branches (e.g. vision vs. transcription) overlap in time.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, Awaitable, Dict, Any, List, Optional
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: List[str] = field(default_factory=list)
+    weight: float = 1.0
+    status: str = ""
+    label: str = ""
+    # Whether the output can be persisted and reused when a failed job resumes
+    checkpoint: bool = True
+
+
+async def run_stage_graph(
+    stages: List[Stage],
+    results: Optional[Dict[str, Any]] = None,
+    on_stage_start: Optional[Callable[[Stage], Awaitable[None]]] = None,
+    on_stage_complete: Optional[Callable[[Stage, Dict[str, Any]], Awaitable[None]]] = None
+) -> Dict[str, Any]:
+    """Run `stages` respecting depends_on and return {stage name: output}.
+
+    Stages whose name is already in `results` are treated as done and skipped,
+    as are stages whose dependents are all done already (e.g. media prep when
+    every consumer was restored from a checkpoint). Each stage receives the
+    results dict populated with its dependencies.
+    If any stage raises, the others still running are cancelled and the error propagates.
+    """
+    results = dict(results or {})
+    names = {stage.name for stage in stages} | set(results)
+    for stage in stages:
+        missing = [dep for dep in stage.depends_on if dep not in names]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+
+    dependents = {stage.name: [s.name for s in stages if stage.name in s.depends_on] for stage in stages}
+    needed = {}
+
+    def must_run(name: str) -> bool:
+        if name not in needed:
+            # Provisionally needed, so a cycle terminates here and is reported below
+            needed[name] = True
+            needed[name] = name not in results and (
+                not dependents[name] or any(must_run(d) for d in dependents[name])
+            )
+        return needed[name]
+
+    pending = {stage.name: stage for stage in stages if must_run(stage.name)}
+    running: Dict[asyncio.Task, Stage] = {}
+
+    try:
+        while pending or running:
+            ready = [s for s in pending.values() if all(dep in results for dep in s.depends_on)]
+            for stage in ready:
+                del pending[stage.name]
+                if on_stage_start:
+                    await on_stage_start(stage)
+                running[asyncio.create_task(stage.run(results))] = stage
+
+            if not running:
+                raise ValueError(f"Stage graph has a dependency cycle: {sorted(pending)}")
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage = running.pop(task)
+                results[stage.name] = task.result()
+                if on_stage_complete:
+                    await on_stage_complete(stage, results)
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    return results
@@ -0,0 +1,102 @@
+"""
+Structured Output
+Requests chat completions constrained to the JSON schema of a pydantic model,
+validates the reply against that model and, if validation fails, makes one
+repair request quoting the validation errors before giving up.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Type, TypeVar
+
+from openai import AsyncOpenAI
+from pydantic import BaseModel, ValidationError
+
+from services.openai_client import endpoint_limit
+
+T = TypeVar("T", bound=BaseModel)
+
+# Keywords pydantic emits that strict structured outputs reject or don't need
+_DROPPED_KEYWORDS = ("title", "default", "description")
+
+
+class StructuredOutputError(ValueError):
+    """The model's reply still failed validation after the repair attempt"""
+
+
+@lru_cache(maxsize=None)
+def _strict_schema(model_cls: Type[BaseModel]) -> Dict[str, Any]:
+    schema = model_cls.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def convert(node):
+        if isinstance(node, list):
+            return [convert(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+        if "$ref" in node:
+            return convert(defs[node["$ref"].split("/")[-1]])
+        node = {k: convert(v) for k, v in node.items() if k not in _DROPPED_KEYWORDS}
+        if node.get("type") == "object" and "properties" in node:
+            # Strict mode: every property required (nullable ones via anyOf null), nothing extra
+            node["required"] = list(node["properties"])
+            node["additionalProperties"] = False
+        return node
+
+    return convert(schema)
+
+
+def strict_json_schema(model_cls: Type[BaseModel]) -> Dict[str, Any]:
+    """JSON schema for `model_cls` in the form strict structured outputs accept"""
+    return _strict_schema(model_cls)
+
+
+def describe_validation_error(error: ValidationError, limit: int = 10) -> str:
+    return "\n".join(
+        f"- {'.'.join(str(part) for part in err['loc']) or '(root)'}: {err['msg']}"
+        for err in error.errors()[:limit]
+    )
+
+
+async def request_structured(
+    client: AsyncOpenAI,
+    model_cls: Type[T],
+    messages: List[Dict[str, Any]],
+    max_tokens: int = 500,
+    endpoint: str = "chat",
+    model: str = "gpt-4o"
+) -> T:
+    """Chat completion validated as `model_cls`, with one targeted repair retry"""
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {"name": model_cls.__name__, "strict": True, "schema": strict_json_schema(model_cls)}
+    }
+
+    async def complete(conversation: List[Dict[str, Any]]) -> str:
+        async with endpoint_limit(endpoint):
+            response = await client.chat.completions.create(
+                model=model,
+                messages=conversation,
+                max_tokens=max_tokens,
+                response_format=response_format
+            )
+        return response.choices[0].message.content or ""
+
+    content = await complete(messages)
+    try:
+        return model_cls.model_validate_json(content)
+    except ValidationError as e:
+        print(f"{model_cls.__name__} failed validation, requesting a repair:\n{describe_validation_error(e)}")
+        repair = messages + [
+            {"role": "assistant", "content": content},
+            {"role": "user", "content": (
+                f"That JSON failed validation:\n{describe_validation_error(e)}\n"
+                "Return the corrected JSON object only, keeping every valid field unchanged."
+            )}
+        ]
+
+    content = await complete(repair)
+    try:
+        return model_cls.model_validate_json(content)
+    except ValidationError as e:
+        raise StructuredOutputError(
+            f"{model_cls.__name__} still invalid after repair:\n{describe_validation_error(e)}"
+        ) from e
@@ -0,0 +1,102 @@
+"""
+Transcript Cache
+Content-addressed cache of transcription results keyed on a hash of the
+extracted PCM plus the transcription model/version, so re-processing the
+same video skips Whisper entirely.
+"""
+import os
+import hashlib
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Optional, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING
+
+from utils.pcm_audio import read_wav_header
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPTION_MODEL = "whisper-1"
+# Bump when chunking/stitching changes what a cached transcript looks like
+TRANSCRIPT_CACHE_VERSION = "1"
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_audio_file(path: str) -> str:
+    """sha256 of the PCM payload (header excluded, so re-extraction with a
+    different ffmpeg build still hits), or of the whole file if it isn't PCM WAV"""
+    try:
+        _, _, offset, size = read_wav_header(path)
+    except ValueError:
+        offset, size = 0, os.path.getsize(path)
+
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        f.seek(offset)
+        remaining = size
+        while remaining > 0:
+            chunk = f.read(min(HASH_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            sha256.update(chunk)
+            remaining -= len(chunk)
+    return sha256.hexdigest()
+
+
+class TranscriptCache:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.ttl_days = int(os.getenv("TRANSCRIPT_CACHE_TTL_DAYS", "30"))
+        self.max_entries = int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "5000"))
+
+    def cache_key(self, audio_hash: str) -> str:
+        return f"{audio_hash}:{TRANSCRIPTION_MODEL}:{TRANSCRIPT_CACHE_VERSION}"
+
+    async def ensure_indexes(self):
+        await self.db.transcripts.create_index("cache_key", unique=True)
+        await self.db.transcripts.create_index("last_accessed_at")
+        # TTL indexes only work on BSON dates, so expires_at is not an ISO string like elsewhere
+        await self.db.transcripts.create_index("expires_at", expireAfterSeconds=0)
+
+    async def get(self, audio_hash: str) -> Optional[Dict[str, Any]]:
+        doc = await self.db.transcripts.find_one_and_update(
+            {"cache_key": self.cache_key(audio_hash)},
+            {
+                "$set": {"last_accessed_at": datetime.now(timezone.utc)},
+                "$inc": {"hits": 1}
+            },
+            projection={"_id": 0, "result": 1}
+        )
+        return doc["result"] if doc else None
+
+    async def put(self, audio_hash: str, result: Dict[str, Any]):
+        now = datetime.now(timezone.utc)
+        await self.db.transcripts.update_one(
+            {"cache_key": self.cache_key(audio_hash)},
+            {
+                "$set": {
+                    "audio_hash": audio_hash,
+                    "model": TRANSCRIPTION_MODEL,
+                    "version": TRANSCRIPT_CACHE_VERSION,
+                    "result": result,
+                    "last_accessed_at": now,
+                    "expires_at": now + timedelta(days=self.ttl_days)
+                },
+                "$setOnInsert": {"created_at": now, "hits": 0}
+            },
+            upsert=True
+        )
+        await self._evict()
+
+    async def _evict(self):
+        """Drop least-recently-used entries beyond max_entries"""
+        excess = await self.db.transcripts.estimated_document_count() - self.max_entries
+        if excess <= 0:
+            return
+        stale = await self.db.transcripts.find(
+            {}, {"_id": 1}
+        ).sort("last_accessed_at", ASCENDING).limit(excess).to_list(excess)
+        if stale:
+            await self.db.transcripts.delete_many({"_id": {"$in": [doc["_id"] for doc in stale]}})
+            logger.info(f"Evicted {len(stale)} cached transcripts")
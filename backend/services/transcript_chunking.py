@@ -0,0 +1,159 @@
+"""
+Transcript Chunking
+Splits long PCM recordings at silences so they can be transcribed
+concurrently, and stitches the per-chunk results back together with
+offset-corrected timestamps. Kept free of API clients so the logic can be
+exercised offline with LocalStubTranscriber.
+"""
+import wave
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Dict, Any
+
+ENERGY_FRAME_SECONDS = 0.02
+ENERGY_BLOCK_FRAMES = 1500  # 30 s of 20 ms frames converted at a time
+
+
+@dataclass
+class AudioChunk:
+    index: int
+    core_start: int  # samples; the part of the recording this chunk is authoritative for
+    core_end: int
+    read_start: int  # samples actually sent, including overlap on either side
+    read_end: int
+
+
+def frame_energy(samples: np.ndarray, sr: int) -> np.ndarray:
+    """Mean-square energy per 20 ms frame, computed block by block"""
+    frame = max(1, int(sr * ENERGY_FRAME_SECONDS))
+    n_frames = len(samples) // frame
+    energy = np.empty(n_frames, dtype=np.float32)
+    for first in range(0, n_frames, ENERGY_BLOCK_FRAMES):
+        last = min(n_frames, first + ENERGY_BLOCK_FRAMES)
+        block = np.asarray(samples[first * frame:last * frame], dtype=np.float32).reshape(-1, frame)
+        energy[first:last] = (block * block).mean(axis=1)
+    return energy
+
+
+def plan_chunks(samples: np.ndarray, sr: int, chunk_seconds: float,
+                search_seconds: float = 30.0, overlap_seconds: float = 1.0) -> List[AudioChunk]:
+    """Cut at the quietest 20 ms frame in the `search_seconds` before each
+    `chunk_seconds` boundary, so no chunk is longer than chunk_seconds + overlap"""
+    total = len(samples)
+    chunk = int(chunk_seconds * sr)
+    if total <= chunk:
+        return [AudioChunk(0, 0, total, 0, total)]
+
+    frame = max(1, int(sr * ENERGY_FRAME_SECONDS))
+    energy = frame_energy(samples, sr)
+    search = int(search_seconds / ENERGY_FRAME_SECONDS)
+    overlap = int(overlap_seconds * sr)
+
+    cuts = [0]
+    while total - cuts[-1] > chunk:
+        target_frame = (cuts[-1] + chunk) // frame
+        lo = max(cuts[-1] // frame + 1, target_frame - search)
+        quietest = lo + int(np.argmin(energy[lo:target_frame + 1]))
+        cuts.append(quietest * frame + frame // 2)
+    cuts.append(total)
+
+    return [
+        AudioChunk(
+            index=i,
+            core_start=start,
+            core_end=end,
+            read_start=max(0, start - overlap),
+            read_end=min(total, end + overlap)
+        )
+        for i, (start, end) in enumerate(zip(cuts[:-1], cuts[1:]))
+    ]
+
+
+def write_wav_chunk(samples: np.ndarray, sr: int, chunk: AudioChunk, path: str) -> str:
+    pcm = np.asarray(samples[chunk.read_start:chunk.read_end])
+    if pcm.dtype != np.int16:
+        pcm = (np.clip(pcm, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(path, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(sr)
+        out.writeframes(pcm.astype("<i2").tobytes())
+    return path
+
+
+def _owned_items(items: List[Dict[str, Any]], chunk: AudioChunk, sr: int, is_last: bool) -> List[Dict[str, Any]]:
+    """Shift chunk-relative timestamps to absolute time and keep only items whose
+    midpoint falls in the chunk's core range, dropping overlap duplicates"""
+    offset = chunk.read_start / sr
+    lo, hi = chunk.core_start / sr, chunk.core_end / sr
+    owned = []
+    for item in items:
+        start = item.get("start", 0) + offset
+        end = item.get("end", 0) + offset
+        mid = (start + end) / 2
+        if lo <= mid < hi or (is_last and mid >= hi):
+            owned.append({**item, "start": round(start, 3), "end": round(end, 3)})
+    return owned
+
+
+def stitch_chunk_results(chunks: List[AudioChunk], results: List[Dict[str, Any]], sr: int, total_samples: int) -> Dict[str, Any]:
+    words, segments = [], []
+    for chunk, result in zip(chunks, results):
+        is_last = chunk.index == len(chunks) - 1
+        words.extend(_owned_items(result.get("words", []), chunk, sr, is_last))
+        segments.extend(_owned_items(result.get("segments", []), chunk, sr, is_last))
+
+    words.sort(key=lambda w: w["start"])
+    segments.sort(key=lambda s: s["start"])
+
+    if segments:
+        text = " ".join(s["text"].strip() for s in segments if s.get("text", "").strip())
+    else:
+        text = " ".join(w["word"].strip() for w in words)
+
+    return {
+        "text": text,
+        "words": words,
+        "segments": segments,
+        "duration": round(total_samples / sr, 3)
+    }
+
+
+class LocalStubTranscriber:
+    """Offline stand-in for Whisper: every burst of sound becomes one word
+    (`w1`, `w2`, ... in order of appearance within the file) and every run of
+    bursts separated by less than `segment_gap` seconds becomes one segment.
+    Timestamps are relative to the file, exactly like the real API."""
+    def __init__(self, threshold: float = 1e-4, segment_gap: float = 1.0):
+        self.threshold = threshold
+        self.segment_gap = segment_gap
+        self.calls = 0
+
+    async def __call__(self, audio_path: str) -> Dict[str, Any]:
+        self.calls += 1
+        with wave.open(audio_path, "rb") as f:
+            sr = f.getframerate()
+            pcm = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+
+        voiced = frame_energy(pcm.astype(np.float32) / 32768.0, sr) > self.threshold
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+
+        words = [
+            {"word": f"w{i + 1}", "start": start * ENERGY_FRAME_SECONDS, "end": end * ENERGY_FRAME_SECONDS}
+            for i, (start, end) in enumerate(zip(edges[::2], edges[1::2]))
+        ]
+
+        segments = []
+        for word in words:
+            if segments and word["start"] - segments[-1]["end"] < self.segment_gap:
+                segments[-1]["end"] = word["end"]
+                segments[-1]["text"] += f" {word['word']}"
+            else:
+                segments.append({"text": word["word"], "start": word["start"], "end": word["end"]})
+
+        return {
+            "text": " ".join(w["word"] for w in words),
+            "words": words,
+            "segments": segments,
+            "duration": len(pcm) / sr
+        }
@@ -0,0 +1,149 @@
+"""
+Transcript Condensation
+Keeps the transcripts sent to the NLP prompts within a token budget. Short
+talks pass through untouched; above the threshold a representative
+condensed version is built either by sampling contiguous runs of Whisper
+segments across the whole talk, or by summarizing chunks concurrently
+(map-reduce). The full transcript is still what goes into the report.
+"""
+import os
+import asyncio
+from typing import List, Dict, Any
+
+from openai import AsyncOpenAI
+from services.openai_client import get_openai_client, endpoint_limit
+from services.transcript_structure import TranscriptStructure
+from utils.token_count import count_tokens
+
+TRANSCRIPT_TOKEN_THRESHOLD = int(os.getenv("TRANSCRIPT_TOKEN_THRESHOLD", "4000"))
+TRANSCRIPT_TARGET_TOKENS = int(os.getenv("TRANSCRIPT_TARGET_TOKENS", "3000"))
+# sample (no extra API calls) | summarize (one concurrent summary call per chunk)
+TRANSCRIPT_CONDENSE_MODE = os.getenv("TRANSCRIPT_CONDENSE_MODE", "sample")
+SAMPLE_WINDOWS = 8
+SUMMARY_CHUNK_TOKENS = 3000
+
+
+def _timestamp(seconds: float) -> str:
+    return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
+
+
+def _segments_with_tokens(structure: TranscriptStructure) -> List[Dict[str, Any]]:
+    if not structure.segments:
+        # Older or non-Whisper results: sentences stand in for segments
+        return [{"text": s.text, "start": s.start, "tokens": s.token_count} for s in structure.sentences]
+    return [
+        {**s, "text": s["text"].strip(), "tokens": count_tokens(s["text"])}
+        for s in structure.segments if s["text"].strip()
+    ]
+
+
+def _format_run(run: List[Dict[str, Any]]) -> str:
+    text = " ".join(s["text"] for s in run)
+    if run[0].get("start") is None:
+        return text
+    return f"[{_timestamp(run[0]['start'])}] {text}"
+
+
+def sample_segments(segments: List[Dict[str, Any]], target_tokens: int, windows: int = SAMPLE_WINDOWS) -> List[List[Dict[str, Any]]]:
+    """Contiguous runs of segments from `windows` evenly spaced parts of the talk,
+    each using an equal share of the budget. The opening run starts at the first
+    segment and the closing run ends at the last one."""
+    windows = max(1, min(windows, len(segments)))
+    share = target_tokens / windows
+    bounds = [round(i * len(segments) / windows) for i in range(windows + 1)]
+
+    runs = []
+    for i in range(windows):
+        window = segments[bounds[i]:bounds[i + 1]]
+        if i == windows - 1 and windows > 1:
+            window = window[::-1]
+        run, used = [], 0
+        for segment in window:
+            if run and used + segment["tokens"] > share:
+                break
+            run.append(segment)
+            used += segment["tokens"]
+        if i == windows - 1 and windows > 1:
+            run.reverse()
+        runs.append(run)
+    return runs
+
+
+class TranscriptCondenser:
+    def __init__(self, client: AsyncOpenAI = None, mode: str = TRANSCRIPT_CONDENSE_MODE,
+                 threshold: int = TRANSCRIPT_TOKEN_THRESHOLD, target_tokens: int = TRANSCRIPT_TARGET_TOKENS):
+        self.client = client
+        self.mode = mode
+        self.threshold = threshold
+        self.target_tokens = target_tokens
+
+    async def prepare(self, structure: TranscriptStructure) -> Dict[str, Any]:
+        """Transcript text for the NLP prompts plus how it was derived"""
+        text = structure.text
+        tokens = structure.token_count
+        if tokens <= self.threshold:
+            return {"text": text, "condensed": False, "method": "full", "original_tokens": tokens, "tokens": tokens}
+
+        segments = _segments_with_tokens(structure)
+        condensed, method = None, self.mode
+        if self.mode == "summarize":
+            try:
+                condensed = await self._summarize(segments, structure.duration)
+            except Exception as e:
+                print(f"Transcript summarization failed, sampling segments instead: {e}")
+        if condensed is None:
+            condensed, method = self._sample(segments, structure.duration), "sample"
+
+        print(f"Condensed transcript ({method}): {tokens} -> {count_tokens(condensed)} tokens")
+        return {
+            "text": condensed,
+            "condensed": True,
+            "method": method,
+            "original_tokens": tokens,
+            "tokens": count_tokens(condensed)
+        }
+
+    def _sample(self, segments: List[Dict[str, Any]], duration: float = None) -> str:
+        runs = [run for run in sample_segments(segments, self.target_tokens) if run]
+        kept = sum(len(run) for run in runs)
+        length = f"{duration / 60:.0f}-minute " if duration else ""
+        header = (f"[Condensed transcript: {len(runs)} verbatim excerpts ({kept} of {len(segments)} segments) "
+                  f"spread evenly across a {length}talk; [...] marks omitted speech]")
+        return header + "\n\n" + "\n[...]\n".join(_format_run(run) for run in runs)
+
+    async def _summarize(self, segments: List[Dict[str, Any]], duration: float = None) -> str:
+        client = self.client or get_openai_client()
+
+        chunks, current, used = [], [], 0
+        for segment in segments:
+            if current and used + segment["tokens"] > SUMMARY_CHUNK_TOKENS:
+                chunks.append(current)
+                current, used = [], 0
+            current.append(segment)
+            used += segment["tokens"]
+        if current:
+            chunks.append(current)
+
+        max_tokens = max(150, self.target_tokens // len(chunks))
+
+        async def summarize(chunk: List[Dict[str, Any]]) -> str:
+            prompt = f"""Condense this part of an executive's talk to at most {max_tokens * 3 // 4} words.
+Keep the speaker's own words for key claims, decisions, stories and moments of hedging or filler-heavy speech; keep first-person framing. Do not add commentary.
+
+{_format_run(chunk)}"""
+            async with endpoint_limit("chat"):
+                response = await client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=max_tokens
+                )
+            return response.choices[0].message.content.strip()
+
+        summaries = await asyncio.gather(*(summarize(chunk) for chunk in chunks))
+        length = f"{duration / 60:.0f}-minute " if duration else ""
+        header = f"[Condensed transcript: a {length}talk summarized in {len(chunks)} consecutive parts, quoting the speaker where possible]"
+        parts = [
+            f"Part {i + 1}" + (f" ({_timestamp(chunk[0]['start'])})" if chunk[0].get("start") is not None else "") + f":\n{summary}"
+            for i, (chunk, summary) in enumerate(zip(chunks, summaries))
+        ]
+        return header + "\n\n" + "\n\n".join(parts)
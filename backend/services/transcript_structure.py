@@ -0,0 +1,97 @@
+"""
+Transcript Structure
+Sentence segmentation, normalized word tokens and token counts computed once
+per job from the transcription result and shared by every stage that reads
+the transcript (speaking rate, fillers, sentence clarity, NLP prompts).
+Sentences are aligned to Whisper words so each one carries its word span
+and timestamps.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
+
+from services.filler_detection import normalize_token, normalize_words
+from utils.token_count import count_tokens
+
+# Whitespace after terminal punctuation; unlike splitting on [.!?] this keeps "3.5" intact
+_SENTENCE_SPLIT = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')\]]))\s+')
+# How far ahead to look for a sentence token among the words before giving up on it
+ALIGN_LOOKAHEAD = 8
+
+
+@dataclass
+class Sentence:
+    index: int
+    text: str
+    word_count: int
+    token_count: int
+    word_start: Optional[int] = None  # span in the words list, end exclusive
+    word_end: Optional[int] = None
+    start: Optional[float] = None
+    end: Optional[float] = None
+
+
+@dataclass
+class TranscriptStructure:
+    text: str
+    words: List[Dict[str, Any]]
+    tokens: List[str]  # normalize_words(words), aligned with words
+    sentences: List[Sentence]
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+    duration: Optional[float] = None
+    token_count: int = 0
+
+    @classmethod
+    def build(cls, transcription: Dict[str, Any]) -> "TranscriptStructure":
+        text = transcription.get("text", "") or ""
+        words = transcription.get("words") or []
+        tokens = normalize_words(words)
+
+        sentences = []
+        cursor = 0
+        for part in _SENTENCE_SPLIT.split(text):
+            part = part.strip()
+            if not part or not re.search(r'\w', part):
+                continue
+            sentence = Sentence(
+                index=len(sentences),
+                text=part,
+                word_count=len(part.split()),
+                token_count=count_tokens(part)
+            )
+            cursor = _align(sentence, tokens, words, cursor)
+            sentences.append(sentence)
+
+        return cls(
+            text=text,
+            words=words,
+            tokens=tokens,
+            sentences=sentences,
+            segments=transcription.get("segments") or [],
+            duration=transcription.get("duration"),
+            token_count=sum(s.token_count for s in sentences)
+        )
+
+    def longest_sentences(self, k: int) -> List[Sentence]:
+        return sorted(self.sentences, key=lambda s: s.word_count, reverse=True)[:k]
+
+
+def _align(sentence: Sentence, tokens: List[str], words: List[Dict[str, Any]], cursor: int) -> int:
+    """Greedily match the sentence's tokens against the words from `cursor` on;
+    sets the word span and timestamps and returns the new cursor"""
+    first = last = None
+    for token in (normalize_token(t) for t in sentence.text.split()):
+        if not token:
+            continue
+        for k in range(cursor, min(cursor + ALIGN_LOOKAHEAD, len(tokens))):
+            if tokens[k] == token:
+                if first is None:
+                    first = k
+                last, cursor = k, k + 1
+                break
+
+    if first is not None:
+        sentence.word_start, sentence.word_end = first, last + 1
+        sentence.start = round(words[first].get("start", 0), 2)
+        sentence.end = round(words[last].get("end", 0), 2)
+    return cursor
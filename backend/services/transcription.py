@@ -1,43 +1,56 @@
 import os
+import shutil
 import tempfile
 import asyncio
 from emergentintegrations.llm.openai import OpenAISpeechToText
 from dotenv import load_dotenv
 from pydub import AudioSegment
-import subprocess
 from pathlib import Path
+from services.media_prep import probe_media_sync
+from services.transcript_chunking import plan_chunks, write_wav_chunk, stitch_chunk_results
+from utils.pcm_audio import open_pcm_memmap, read_wav_header
+from openai import AsyncOpenAI
+from services.openai_client import get_openai_client, endpoint_limit
 
 ROOT_DIR = Path(__file__).parent.parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Whisper rejects uploads above 25 MB; keep some headroom for container overhead
+UPLOAD_LIMIT_BYTES = int(25 * 1024 * 1024 * 0.9)
+
+# Upload encodings in order of preference. The local PCM WAV stays untouched for librosa.
+UPLOAD_ENCODINGS = [
+    {"codec": "opus", "bitrate_kbps": 32, "suffix": ".ogg", "args": ['-c:a', 'libopus', '-application', 'voip']},
+    {"codec": "opus", "bitrate_kbps": 16, "suffix": ".ogg", "args": ['-c:a', 'libopus', '-application', 'voip']},
+    {"codec": "mp3", "bitrate_kbps": 32, "suffix": ".mp3", "args": ['-c:a', 'libmp3lame']},
+    {"codec": "mp3", "bitrate_kbps": 16, "suffix": ".mp3", "args": ['-c:a', 'libmp3lame']},
+]
+
+
+def select_upload_encodings(duration_seconds: float, preferred: str = "auto") -> list:
+    """Encodings expected to stay under the upload limit for this duration, best first"""
+    if preferred == "wav":
+        return []
+    candidates = [e for e in UPLOAD_ENCODINGS if preferred in ("auto", e["codec"])]
+    fitting = [e for e in candidates if e["bitrate_kbps"] * 1000 / 8 * duration_seconds <= UPLOAD_LIMIT_BYTES]
+    # Nothing fits (only possible for very long unchunked audio): try the smallest anyway
+    return fitting or candidates[-1:]
+
 class TranscriptionService:
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-        self.api_key = api_key
+    def __init__(self, transcriber=None, client: AsyncOpenAI = None):
+        self.client = client or get_openai_client()
+        # Any async callable path -> {text, words, segments, duration}; LocalStubTranscriber works offline
+        self.transcribe_file = transcriber or self._transcribe_with_whisper
+        self.chunk_seconds = float(os.getenv("TRANSCRIPTION_CHUNK_SECONDS", "600"))
+        self.max_concurrency = int(os.getenv("TRANSCRIPTION_MAX_CONCURRENCY", "4"))
+        # auto | opus | mp3 | wav (wav uploads the raw PCM as before)
+        self.upload_codec = os.getenv("TRANSCRIPTION_UPLOAD_CODEC", "auto")
     
     def detect_video_format(self, video_path: str) -> str:
-        """Detect the actual video format using ffprobe"""
+        """Detect the actual video format using a single ffprobe call"""
         try:
-            result = subprocess.run(
-                ['/usr/bin/ffprobe', '-v', 'error', '-select_streams', 'v:0', 
-                 '-show_entries', 'stream=codec_name', '-of', 'default=noprint_wrappers=1:nokey=1',
-                 video_path],
-                capture_output=True, text=True, timeout=10
-            )
-            codec = result.stdout.strip()
-            
-            # Also check container format
-            result2 = subprocess.run(
-                ['/usr/bin/ffprobe', '-v', 'error', '-show_entries', 
-                 'format=format_name', '-of', 'default=noprint_wrappers=1:nokey=1',
-                 video_path],
-                capture_output=True, text=True, timeout=10
-            )
-            format_name = result2.stdout.strip()
-            
-            return format_name, codec
+            probe = probe_media_sync(video_path)
+            return probe["format_name"], probe["video_codec"] or "unknown"
         except Exception as e:
             print(f"Error detecting format: {e}")
             return "unknown", "unknown"
@@ -155,17 +168,86 @@ class TranscriptionService:
         return None
     
     async def transcribe_audio(self, audio_path: str) -> dict:
-        import openai
-        client = openai.OpenAI(api_key=self.api_key)
-        
-        with open(audio_path, "rb") as audio_file:
-            response = await asyncio.to_thread(
-                client.audio.transcriptions.create,
-                file=audio_file,
-                model="whisper-1",
-                response_format="verbose_json",
-                timestamp_granularities=["word", "segment"]
+        """Transcribe a recording, splitting long PCM audio at silences and
+        transcribing the chunks concurrently"""
+        try:
+            samples, sr = open_pcm_memmap(audio_path)
+        except ValueError:
+            return await self.transcribe_file(audio_path)
+        
+        chunks = plan_chunks(samples, sr, self.chunk_seconds)
+        if len(chunks) == 1:
+            return await self.transcribe_file(audio_path)
+        
+        chunk_dir = tempfile.mkdtemp(prefix="transcribe_chunks_")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def transcribe_chunk(chunk):
+            async with semaphore:
+                chunk_path = os.path.join(chunk_dir, f"chunk_{chunk.index:03d}.wav")
+                await asyncio.to_thread(write_wav_chunk, samples, sr, chunk, chunk_path)
+                try:
+                    return await self.transcribe_file(chunk_path)
+                finally:
+                    os.unlink(chunk_path)
+        
+        try:
+            print(f"Transcribing {len(chunks)} chunks of up to {self.chunk_seconds:.0f}s")
+            results = await asyncio.gather(*(transcribe_chunk(chunk) for chunk in chunks))
+        finally:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+        
+        return stitch_chunk_results(chunks, results, sr, len(samples))
+    
+    async def encode_for_upload(self, audio_path: str) -> str | None:
+        """Compress PCM audio for the transcription upload only; returns None to upload as-is"""
+        try:
+            sample_rate, channels, _, data_size = read_wav_header(audio_path)
+            duration = data_size / (sample_rate * channels * 2)
+        except (ValueError, OSError):
+            return None
+        
+        for encoding in select_upload_encodings(duration, self.upload_codec):
+            # ffmpeg -y overwrites the empty file created here
+            with tempfile.NamedTemporaryFile(suffix=encoding["suffix"], delete=False) as upload_file:
+                upload_path = upload_file.name
+            command = [
+                '/usr/bin/ffmpeg', '-v', 'error', '-i', audio_path,
+                *encoding["args"], '-b:a', f"{encoding['bitrate_kbps']}k",
+                '-y', upload_path
+            ]
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
+            _, stderr = await process.communicate()
+            
+            if process.returncode == 0 and os.path.exists(upload_path) and os.path.getsize(upload_path) > 0:
+                print(f"Upload encoding: {encoding['codec']} {encoding['bitrate_kbps']}kbps, "
+                      f"{os.path.getsize(audio_path)} -> {os.path.getsize(upload_path)} bytes")
+                return upload_path
+            
+            print(f"Upload encoding {encoding['codec']} failed: {stderr.decode()[:200]}")
+            if os.path.exists(upload_path):
+                os.unlink(upload_path)
+        
+        return None
+    
+    async def _transcribe_with_whisper(self, audio_path: str) -> dict:
+        upload_path = await self.encode_for_upload(audio_path)
+        try:
+            with open(upload_path or audio_path, "rb") as audio_file:
+                async with endpoint_limit("transcription"):
+                    response = await self.client.audio.transcriptions.create(
+                        file=audio_file,
+                        model="whisper-1",
+                        response_format="verbose_json",
+                        timestamp_granularities=["word", "segment"]
+                    )
+        finally:
+            if upload_path and os.path.exists(upload_path):
+                os.unlink(upload_path)
         
         words_list = []
         if hasattr(response, 'words') and response.words:
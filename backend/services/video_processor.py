@@ -7,19 +7,31 @@ sys.path.append('/app/backend')
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from services.transcription import TranscriptionService
 from services.audio_analysis import AudioAnalysisService
-from services.vision_analysis import VisionAnalysisService
-from services.nlp_analysis import NLPAnalysisService
-from utils.gridfs_helper import get_video_from_gridfs
+from services.vision_analysis import VisionAnalysisService, FIRST_IMPRESSION_FRAMES
+from services.nlp_analysis import NLPAnalysisService, NLP_ANALYSIS_MODE
+from services.heuristic_analysis import HeuristicAnalysisService
+from services.transcript_structure import TranscriptStructure
+from services.media_prep import MediaPrepService
+from services.pipeline import Stage, run_stage_graph
+from services.transcript_cache import TranscriptCache, hash_audio_file
+from services.openai_client import get_openai_client
+from services.transcript_condense import TranscriptCondenser
+from utils.gridfs_helper import download_video_to_file
 import uuid
 from datetime import datetime, timezone
 
 class VideoProcessorService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
-        self.transcription_service = TranscriptionService()
+        openai_client = get_openai_client()
+        self.transcription_service = TranscriptionService(client=openai_client)
         self.audio_service = AudioAnalysisService()
-        self.vision_service = VisionAnalysisService()
-        self.nlp_service = NLPAnalysisService()
+        self.vision_service = VisionAnalysisService(client=openai_client)
+        self.nlp_service = NLPAnalysisService(client=openai_client)
+        self.heuristic_service = HeuristicAnalysisService()
+        self.transcript_condenser = TranscriptCondenser(client=openai_client)
+        self.media_prep = MediaPrepService(frame_fps=2)
+        self.transcript_cache = TranscriptCache(db)
     
     async def update_job_status(self, job_id: str, status: str, progress: float, step: str, extra_fields: dict | None = None):
         update = {
@@ -35,139 +47,408 @@ class VideoProcessorService:
             {"$set": update}
         )
     
-    async def process_video(self, job_id: str, video_id: str, user_id: str):
+    def _build_stages(self, ctx: dict) -> list:
+        """Analysis pipeline as a dependency graph; independent branches run concurrently"""
+        if ctx["tier"] == "fast":
+            # No vision or GPT-4o calls: gravitas and storytelling come from transcript heuristics
+            return [
+                Stage("media", lambda r: self._stage_media(ctx), [],
+                      weight=1, status="transcribing", label="Extracting audio...", checkpoint=False),
+                Stage("transcription", lambda r: self._stage_transcription(r), ["media"],
+                      weight=3, status="transcribing", label="Transcribing speech..."),
+                Stage("vocal", lambda r: self._stage_vocal(r), ["media"],
+                      weight=1, status="audio_analysis", label="Analyzing vocal delivery..."),
+                Stage("communication", lambda r: self._stage_communication(ctx, r), ["transcription", "vocal"],
+                      weight=1, status="audio_analysis", label="Analyzing speech patterns..."),
+                Stage("nlp", lambda r: self._stage_heuristics(ctx, r), ["transcription", "communication"],
+                      weight=1, status="nlp_analysis", label="Estimating leadership signals..."),
+                Stage("scoring", lambda r: self._stage_scoring(r), ["communication", "nlp"],
+                      weight=1, status="scoring", label="Calculating scores..."),
+            ]
+        
+        return [
+            Stage("media", lambda r: self._stage_media(ctx), [],
+                  weight=1, status="transcribing", label="Extracting audio...", checkpoint=False),
+            Stage("transcription", lambda r: self._stage_transcription(r), ["media"],
+                  weight=3, status="transcribing", label="Transcribing speech..."),
+            Stage("vocal", lambda r: self._stage_vocal(r), ["media"],
+                  weight=1, status="audio_analysis", label="Analyzing vocal delivery..."),
+            Stage("communication", lambda r: self._stage_communication(ctx, r), ["transcription", "vocal"],
+                  weight=1, status="audio_analysis", label="Analyzing speech patterns..."),
+            Stage("presence", lambda r: self._stage_presence(r), ["media"],
+                  weight=2, status="video_analysis", label="Analyzing visual presence..."),
+            # The combined NLP call also writes the coaching tips, so it needs the delivery metrics
+            Stage("nlp", lambda r: self._stage_nlp(ctx, r),
+                  ["transcription", "communication", "presence"] if NLP_ANALYSIS_MODE == "combined" else ["transcription"],
+                  weight=2, status="nlp_analysis", label="Analyzing leadership signals..."),
+            Stage("scoring", lambda r: self._stage_scoring(r), ["communication", "presence", "nlp"],
+                  weight=1, status="scoring", label="Calculating scores..."),
+        ]
+    
+    async def process_video(self, job_id: str, video_id: str, user_id: str, tier: str = "full", report_id: str = None):
+        """Run the analysis, publishing each section to the report as its stage completes.
+        With `report_id` (a retry, or the refinement of a fast-tier preview) the existing
+        report is updated in place instead of creating a new one."""
+        ctx = {"job_id": job_id, "video_id": video_id, "user_id": user_id, "tier": tier, "media": {}}
+        stages = self._build_stages(ctx)
+        checkpoints = await self._load_checkpoints(job_id)
+        total_weight = sum(stage.weight for stage in stages)
+        completed = {"weight": sum(stage.weight for stage in stages if stage.name in checkpoints)}
+        
+        async def on_stage_start(stage: Stage):
+            progress = 5 + 90 * completed["weight"] / total_weight
+            await self.update_job_status(job_id, stage.status, round(progress, 1), stage.label,
+                                         extra_fields={f"stages.{stage.name}": "running"})
+        
+        async def on_stage_complete(stage: Stage, results: dict):
+            completed["weight"] += stage.weight
+            if stage.checkpoint:
+                await self._save_checkpoint(ctx, stage.name, results[stage.name])
+            await self._publish_sections(ctx, stage.name, results[stage.name])
+            await self.db.video_jobs.update_one(
+                {"job_id": job_id},
+                {"$set": {
+                    "progress": round(5 + 90 * completed["weight"] / total_weight, 1),
+                    f"stages.{stage.name}": "completed",
+                    "updated_at": datetime.now(timezone.utc).isoformat()
+                }}
+            )
+        
         try:
-            await self.update_job_status(job_id, "transcribing", 10, "Extracting audio...")
-            
-            video_data = await get_video_from_gridfs(self.db, video_id)
-            
-            # Get video metadata to determine actual format
-            metadata = await self.db.video_metadata.find_one({"video_id": video_id}, {"_id": 0})
-            content_type = metadata.get("format", "video/mp4") if metadata else "video/mp4"
-            filename = metadata.get("filename", "video.mp4") if metadata else "video.mp4"
-            
-            # Determine file extension based on content type or filename
-            if "webm" in content_type.lower() or filename.lower().endswith(".webm"):
-                suffix = ".webm"
-            elif "quicktime" in content_type.lower() or filename.lower().endswith(".mov"):
-                suffix = ".mov"
-            elif "avi" in content_type.lower() or filename.lower().endswith(".avi"):
-                suffix = ".avi"
+            report_id = await self._open_report(ctx, report_id)
+            if checkpoints:
+                print(f"Resuming job {job_id} from checkpoints: {sorted(checkpoints)}")
+                await self.update_job_status(job_id, "transcribing", round(5 + 90 * completed["weight"] / total_weight, 1),
+                                             "Resuming from last completed step...")
             else:
-                suffix = ".mp4"
-            
-            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_video:
-                temp_video.write(video_data)
-                video_path = temp_video.name
-            
-            print(f"Processing video: {video_path}, content_type: {content_type}, filename: {filename}")
-            
-            audio_path = await self.transcription_service.extract_audio_from_video(video_path)
-            
-            await self.update_job_status(job_id, "transcribing", 20, "Transcribing speech...")
-            transcription_result = await self.transcription_service.transcribe_audio(audio_path)
-            
-            transcript = transcription_result["text"]
-            words = transcription_result.get("words", [])
-            duration = transcription_result.get("duration", 180)
-            
-            await self.update_job_status(job_id, "audio_analysis", 35, "Analyzing speech patterns...")
-            
-            speaking_rate = self.audio_service.analyze_speaking_rate(transcript, duration)
-            pauses = self.audio_service.detect_pauses(words)
-            filler_analysis = self.audio_service.detect_filler_words(transcript, words)
-            vocal_metrics = await self.audio_service.analyze_vocal_metrics(audio_path)
-            sentence_clarity = self.audio_service.analyze_sentence_clarity(transcript)
-            
-            communication_metrics = {
-                "speaking_rate": speaking_rate,
-                "pauses": pauses,
-                "filler_words": filler_analysis,
-                "vocal_metrics": vocal_metrics,
-                "sentence_clarity": sentence_clarity
-            }
-            
-            await self.update_job_status(job_id, "video_analysis", 50, "Analyzing visual presence...")
-            
-            frames = self.vision_service.extract_frames(video_path, fps=2)
-            vision_result = await self.vision_service.analyze_with_gpt4o(frames)
-            
-            presence_metrics = {
-                "posture_score": vision_result.get("posture_score", 0),
-                "eye_contact_ratio": vision_result.get("eye_contact_ratio", 0),
-                "facial_expressions": vision_result.get("facial_expressions", {}),
-                "gesture_rate": vision_result.get("gesture_rate", 0),
-                "first_impression_score": vision_result.get("first_impression_score", 0)
-            }
-            
-            await self.update_job_status(job_id, "nlp_analysis", 70, "Analyzing leadership signals...")
+                await self.update_job_status(job_id, "transcribing", 5, "Preparing video...")
             
-            user_profile = await self.db.user_profiles.find_one({"user_id": user_id}, {"_id": 0})
+            results = await run_stage_graph(stages, results=checkpoints,
+                                            on_stage_start=on_stage_start, on_stage_complete=on_stage_complete)
             
-            gravitas_analysis = await self.nlp_service.analyze_gravitas(transcript, user_profile)
-            storytelling_analysis = await self.nlp_service.analyze_storytelling(transcript, user_profile)
+            transcript = results["transcription"]["text"]
+            scoring = results["scoring"]
+            scores = scoring["all_metrics"]["scores"]
             
-            await self.update_job_status(job_id, "scoring", 85, "Calculating scores...")
-            
-            scores = self._calculate_scores(
-                communication_metrics,
-                presence_metrics,
-                gravitas_analysis,
-                storytelling_analysis
-            )
-            
-            all_metrics = {
-                "communication": communication_metrics,
-                "presence": presence_metrics,
-                "gravitas": gravitas_analysis,
-                "storytelling": storytelling_analysis,
-                "scores": scores
-            }
-            
-            coaching_tips = await self.nlp_service.generate_coaching_tips(all_metrics)
-            
-            report_id = f"report_{uuid.uuid4().hex}"
             report_doc = {
-                "report_id": report_id,
-                "user_id": user_id,
-                "video_id": video_id,
-                "job_id": job_id,
                 "transcript": transcript,
                 "overall_score": scores["overall"],
                 "gravitas_score": scores["gravitas"],
                 "communication_score": scores["communication"],
                 "presence_score": scores["presence"],
                 "storytelling_score": scores.get("storytelling"),
-                "detailed_metrics": all_metrics,
-                "coaching_tips": coaching_tips,
-                "created_at": datetime.now(timezone.utc).isoformat()
+                "detailed_metrics": scoring["all_metrics"],
+                "coaching_tips": scoring["coaching_tips"],
+                "tier": tier,
+                "analysis_method": results["nlp"].get("method", "llm"),
+                "sections_ready": ["transcript", "communication"] + (["presence"] if "presence" in results else [])
+                                  + ["gravitas", "storytelling", "tips", "scores"],
+                "status": "completed",
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+                "updated_at": datetime.now(timezone.utc).isoformat()
             }
+            if ctx["refining"]:
+                report_doc.update({"refinement_status": "completed", "refined_at": report_doc["completed_at"]})
             
-            await self.db.ep_reports.insert_one(report_doc)
+            await self.db.ep_reports.update_one({"report_id": report_id}, {"$set": report_doc})
             
             await self.update_job_status(job_id, "completed", 100, "Report generated", extra_fields={"report_id": report_id})
-            
-            os.unlink(video_path)
-            if os.path.exists(audio_path):
-                os.unlink(audio_path)
+            await self.db.job_artifacts.delete_many({"job_id": job_id})
             
             return report_id
             
         except Exception as e:
-            await self.db.video_jobs.update_one(
-                {"job_id": job_id},
-                {"$set": {
-                    "status": "failed",
-                    "error": str(e),
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }}
+            # Retry/backoff and the final "failed" status are owned by VideoJobQueue
+            print(f"Processing failed for job {job_id}: {e}")
+            raise
+        finally:
+            media = ctx["media"]
+            for path in (media.get("video_path"), media.get("audio_path")):
+                if path and os.path.exists(path):
+                    os.unlink(path)
+            self.media_prep.cleanup(media.get("prepared"))
+    
+    async def ensure_indexes(self):
+        await self.db.job_artifacts.create_index([("job_id", 1), ("stage", 1)], unique=True)
+        await self.db.job_artifacts.create_index("video_id")
+        await self.db.ep_reports.create_index("report_id")
+        await self.db.ep_reports.create_index("job_id")
+        await self.transcript_cache.ensure_indexes()
+    
+    async def _open_report(self, ctx: dict, report_id: str = None) -> str:
+        """Create (or reopen) the report that stage outputs are published to, and point
+        the job at it so clients can read partial results while the job runs"""
+        now = datetime.now(timezone.utc).isoformat()
+        existing = None
+        if report_id:
+            existing = await self.db.ep_reports.find_one({"report_id": report_id}, {"_id": 0, "status": 1})
+        else:
+            report_id = f"report_{uuid.uuid4().hex}"
+        
+        # Reports written before progressive delivery have no status and are complete
+        ctx["refining"] = existing is not None and existing.get("status", "completed") == "completed"
+        if ctx["refining"]:
+            # Keep serving the fast-tier preview; the full results replace it in one write at the end
+            await self.db.ep_reports.update_one(
+                {"report_id": report_id},
+                {"$set": {"refinement_job_id": ctx["job_id"], "refinement_status": "processing", "updated_at": now}}
+            )
+        else:
+            await self.db.ep_reports.update_one(
+                {"report_id": report_id},
+                {
+                    "$set": {"status": "processing", "tier": ctx["tier"], "updated_at": now},
+                    "$setOnInsert": {
+                        "report_id": report_id,
+                        "user_id": ctx["user_id"],
+                        "video_id": ctx["video_id"],
+                        "job_id": ctx["job_id"],
+                        "sections_ready": [],
+                        "created_at": now
+                    }
+                },
+                upsert=True
+            )
+        
+        ctx["report_id"] = report_id
+        await self.db.video_jobs.update_one({"job_id": ctx["job_id"]}, {"$set": {"report_id": report_id}})
+        return report_id
+    
+    async def _publish_sections(self, ctx: dict, stage_name: str, output):
+        """$set the report sections a completed stage produces; overall score and the
+        remaining sections follow from the scoring stage"""
+        if ctx["refining"]:
+            return
+        
+        if stage_name == "transcription":
+            fields, sections = {"transcript": output["text"]}, ["transcript"]
+        elif stage_name == "communication":
+            fields = {
+                "detailed_metrics.communication": output,
+                "communication_score": round(self._calculate_communication_score(output), 1)
+            }
+            sections = ["communication"]
+        elif stage_name == "presence":
+            fields = {
+                "detailed_metrics.presence": output,
+                "presence_score": round(self._calculate_presence_score(output), 1)
+            }
+            sections = ["presence"]
+        elif stage_name == "nlp":
+            storytelling_score = self._calculate_storytelling_score(output["storytelling"])
+            fields = {
+                "detailed_metrics.gravitas": output["gravitas"],
+                "detailed_metrics.storytelling": output["storytelling"],
+                "gravitas_score": round(output["gravitas"]["overall_gravitas"], 1),
+                "storytelling_score": round(storytelling_score, 1) if storytelling_score else None
+            }
+            sections = ["gravitas", "storytelling"]
+            if output.get("coaching_tips"):
+                fields["coaching_tips"] = output["coaching_tips"]
+                sections.append("tips")
+        else:
+            return
+        
+        fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+        await self.db.ep_reports.update_one(
+            {"report_id": ctx["report_id"]},
+            {"$set": fields, "$addToSet": {"sections_ready": {"$each": sections}}}
+        )
+    
+    async def _load_checkpoints(self, job_id: str) -> dict:
+        """Outputs of stages that completed on an earlier attempt of this job"""
+        artifacts = await self.db.job_artifacts.find({"job_id": job_id}, {"_id": 0, "stage": 1, "output": 1}).to_list(None)
+        return {artifact["stage"]: artifact["output"] for artifact in artifacts}
+    
+    async def _save_checkpoint(self, ctx: dict, stage_name: str, output):
+        await self.db.job_artifacts.update_one(
+            {"job_id": ctx["job_id"], "stage": stage_name},
+            {"$set": {
+                "video_id": ctx["video_id"],
+                "output": output,
+                "created_at": datetime.now(timezone.utc).isoformat()
+            }},
+            upsert=True
+        )
+    
+    async def _stage_media(self, ctx: dict) -> dict:
+        video_id = ctx["video_id"]
+        media = ctx["media"]
+        
+        # Get video metadata to determine actual format
+        metadata = await self.db.video_metadata.find_one({"video_id": video_id}, {"_id": 0})
+        content_type = metadata.get("format", "video/mp4") if metadata else "video/mp4"
+        filename = metadata.get("filename", "video.mp4") if metadata else "video.mp4"
+        
+        # Determine file extension based on content type or filename
+        if "webm" in content_type.lower() or filename.lower().endswith(".webm"):
+            suffix = ".webm"
+        elif "quicktime" in content_type.lower() or filename.lower().endswith(".mov"):
+            suffix = ".mov"
+        elif "avi" in content_type.lower() or filename.lower().endswith(".avi"):
+            suffix = ".avi"
+        else:
+            suffix = ".mp4"
+        
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_video:
+            media["video_path"] = temp_video.name
+        await download_video_to_file(self.db, video_id, media["video_path"])
+        
+        print(f"Processing video: {media['video_path']}, content_type: {content_type}, filename: {filename}")
+        
+        # One probe (cached on video_metadata) and one decode for both audio and frames
+        media["probe"] = None
+        media["prepared"] = None
+        try:
+            media["probe"] = await self.media_prep.get_probe(self.db, video_id, media["video_path"])
+            media["prepared"] = await self.media_prep.prepare(media["video_path"], media["probe"])
+        except Exception as e:
+            print(f"Media prep failed, falling back to per-stage extraction: {e}")
+        
+        prepared = media["prepared"]
+        if prepared and prepared["audio_path"]:
+            media["audio_path"] = prepared["audio_path"]
+        else:
+            media["audio_path"] = await self.transcription_service.extract_audio_from_video(media["video_path"])
+        
+        return media
+    
+    async def _stage_transcription(self, results: dict) -> dict:
+        audio_path = results["media"]["audio_path"]
+        
+        # Re-processing the same audio (retries, double clicks, re-scores) skips Whisper
+        audio_hash = await asyncio.to_thread(hash_audio_file, audio_path)
+        cached = await self.transcript_cache.get(audio_hash)
+        if cached:
+            print(f"Transcript cache hit for audio {audio_hash[:12]}")
+            return cached
+        
+        transcription_result = await self.transcription_service.transcribe_audio(audio_path)
+        await self.transcript_cache.put(audio_hash, transcription_result)
+        return transcription_result
+    
+    async def _stage_vocal(self, results: dict) -> dict:
+        return await self.audio_service.analyze_vocal_metrics(results["media"]["audio_path"])
+    
+    def _transcript_structure(self, ctx: dict, results: dict) -> TranscriptStructure:
+        """Sentences, tokens and timestamps for the transcript, built once per job"""
+        if "transcript_structure" not in ctx:
+            ctx["transcript_structure"] = TranscriptStructure.build(results["transcription"])
+        return ctx["transcript_structure"]
+    
+    async def _stage_communication(self, ctx: dict, results: dict) -> dict:
+        structure = self._transcript_structure(ctx, results)
+        voice_activity = results["vocal"].get("voice_activity")
+        
+        return {
+            "speaking_rate": self.audio_service.analyze_speaking_rate(
+                structure.text, structure.duration, voice_activity, structure.words, structure.tokens),
+            "pauses": self.audio_service.detect_pauses(structure.words, voice_activity),
+            "filler_words": self.audio_service.detect_filler_words(structure.text, structure.words, structure.tokens),
+            "vocal_metrics": results["vocal"],
+            "sentence_clarity": self.audio_service.analyze_sentence_clarity(structure.text, structure)
+        }
+    
+    async def _stage_presence(self, results: dict) -> dict:
+        media = results["media"]
+        probe = media["probe"]
+        prepared = media["prepared"]
+        
+        if prepared and prepared["frame_paths"]:
+            # MediaRecorder WebM has no duration in its header; the decoded frames still span the clip
+            duration = (probe or {}).get("duration") or len(prepared["frame_paths"]) / prepared["frame_fps"]
+            timestamps, first_impression_frames = self.vision_service.plan_frame_timestamps(duration)
+            frames = self.vision_service.select_frames(prepared["frame_paths"], prepared["frame_fps"], timestamps)
+        else:
+            timestamps = None
+            if probe and probe.get("duration"):
+                timestamps, _ = self.vision_service.plan_frame_timestamps(probe["duration"])
+            frames = await self.vision_service.extract_frames(media["video_path"], timestamps)
+            first_impression_frames = FIRST_IMPRESSION_FRAMES
+        vision_result = await self.vision_service.analyze_with_gpt4o(frames, first_impression_frames)
+        
+        return {
+            "posture_score": vision_result.get("posture_score", 0),
+            "eye_contact_ratio": vision_result.get("eye_contact_ratio", 0),
+            "facial_expressions": vision_result.get("facial_expressions", {}),
+            "gesture_rate": vision_result.get("gesture_rate", 0),
+            "first_impression_score": vision_result.get("first_impression_score", 0)
+        }
+    
+    async def _stage_nlp(self, ctx: dict, results: dict) -> dict:
+        # Long talks are condensed for the prompts only; the report keeps the full transcript
+        prepared, user_profile = await asyncio.gather(
+            self.transcript_condenser.prepare(self._transcript_structure(ctx, results)),
+            self.db.user_profiles.find_one({"user_id": ctx["user_id"]}, {"_id": 0})
+        )
+        transcript = prepared["text"]
+        transcript_input = {k: v for k, v in prepared.items() if k != "text"}
+        
+        if NLP_ANALYSIS_MODE == "combined":
+            delivery = {"communication": results["communication"], "presence": results["presence"]}
+            try:
+                combined = await self.nlp_service.analyze_combined(transcript, delivery, user_profile)
+                return {**combined, "method": "llm", "transcript_input": transcript_input}
+            except Exception as e:
+                print(f"Combined NLP analysis failed, falling back to separate calls: {e}")
+        
+        try:
+            gravitas_analysis, storytelling_analysis = await asyncio.gather(
+                self.nlp_service.analyze_gravitas(transcript, user_profile),
+                self.nlp_service.analyze_storytelling(transcript, user_profile)
             )
-            raise e
+        except Exception as e:
+            # Degrade to the fast-tier estimates rather than failing the whole report
+            print(f"NLP analysis unavailable, using transcript heuristics: {e}")
+            return {**await self._stage_heuristics(ctx, results), "transcript_input": transcript_input}
+        
+        # Tips are generated in the scoring stage when they didn't come from the combined call
+        return {"gravitas": gravitas_analysis, "storytelling": storytelling_analysis, "coaching_tips": None,
+                "method": "llm", "transcript_input": transcript_input}
+    
+    async def _stage_heuristics(self, ctx: dict, results: dict) -> dict:
+        """Gravitas and storytelling estimated locally from the transcript, without LLM calls"""
+        structure = self._transcript_structure(ctx, results)
+        return {
+            "gravitas": self.heuristic_service.analyze_gravitas(structure, results.get("communication")),
+            "storytelling": self.heuristic_service.analyze_storytelling(structure),
+            "coaching_tips": None,
+            "method": "heuristic"
+        }
+    
+    async def _stage_scoring(self, results: dict) -> dict:
+        communication_metrics = results["communication"]
+        presence_metrics = results.get("presence")  # absent in the fast tier
+        gravitas_analysis = results["nlp"]["gravitas"]
+        storytelling_analysis = results["nlp"]["storytelling"]
+        
+        scores = self._calculate_scores(
+            communication_metrics,
+            presence_metrics,
+            gravitas_analysis,
+            storytelling_analysis
+        )
+        
+        all_metrics = {
+            "communication": communication_metrics,
+            "presence": presence_metrics,
+            "gravitas": gravitas_analysis,
+            "storytelling": storytelling_analysis,
+            "scores": scores
+        }
+        
+        coaching_tips = results["nlp"].get("coaching_tips")
+        if not coaching_tips and results["nlp"].get("method") == "heuristic":
+            coaching_tips = self.heuristic_service.generate_coaching_tips(all_metrics)
+        elif not coaching_tips:
+            coaching_tips = await self.nlp_service.generate_coaching_tips(all_metrics)
+        
+        return {"all_metrics": all_metrics, "coaching_tips": coaching_tips}
     
     def _calculate_scores(self, comm_metrics, presence_metrics, gravitas_analysis, storytelling_analysis):
         comm_score = self._calculate_communication_score(comm_metrics)
-        presence_score = self._calculate_presence_score(presence_metrics)
-        gravitas_score = gravitas_analysis.get("overall_gravitas", 60)
+        presence_score = self._calculate_presence_score(presence_metrics) if presence_metrics else None
+        gravitas_score = gravitas_analysis["overall_gravitas"]
         storytelling_score = self._calculate_storytelling_score(storytelling_analysis)
         
         weights = {
@@ -183,20 +464,23 @@ class VideoProcessorService:
                 "communication": 0.40,
                 "presence": 0.30
             }
-            overall = (gravitas_score * weights["gravitas"] +
-                      comm_score * weights["communication"] +
-                      presence_score * weights["presence"])
-        else:
-            overall = (gravitas_score * weights["gravitas"] +
-                      comm_score * weights["communication"] +
-                      presence_score * weights["presence"] +
-                      storytelling_score * weights["storytelling"])
+        
+        # Sections that weren't analysed (no presence in the fast tier) are left out and
+        # the remaining weights rescaled; with every section present the total weight is 1
+        component_scores = {
+            "gravitas": gravitas_score,
+            "communication": comm_score,
+            "presence": presence_score,
+            "storytelling": storytelling_score
+        }
+        available = [k for k in weights if component_scores[k] is not None]
+        overall = sum(component_scores[k] * weights[k] for k in available) / sum(weights[k] for k in available)
         
         return {
             "overall": round(overall, 1),
             "gravitas": round(gravitas_score, 1),
             "communication": round(comm_score, 1),
-            "presence": round(presence_score, 1),
+            "presence": round(presence_score, 1) if presence_score is not None else None,
             "storytelling": round(storytelling_score, 1) if storytelling_score else None
         }
     
@@ -207,8 +491,11 @@ class VideoProcessorService:
         filler_rate = metrics["filler_words"]["rate_per_minute"]
         filler_score = max(0, 100 - filler_rate * 20)
         
-        pause_count = len(metrics["pauses"])
-        pause_score = min(100, 60 + pause_count * 2)
+        # Well-timed pauses per minute are rewarded, silences over 2s are not
+        minutes = max(metrics["speaking_rate"].get("duration_minutes", 0), 0.5)
+        timed_pauses = sum(1 for p in metrics["pauses"] if p["type"] != "long")
+        long_pauses = len(metrics["pauses"]) - timed_pauses
+        pause_score = max(0, min(100, 60 + min(timed_pauses / minutes, 8) * 5 - long_pauses / minutes * 10))
         
         return (wpm_score * 0.4 + filler_score * 0.3 + pause_score * 0.3)
     
@@ -115,8 +115,9 @@ class VideoRetentionService:
         # Delete metadata
         await self.db.video_metadata.delete_one({"video_id": video_id})
         
-        # Delete associated jobs
+        # Delete associated jobs and their stage checkpoints
         await self.db.video_jobs.delete_many({"video_id": video_id})
+        await self.db.job_artifacts.delete_many({"video_id": video_id})
         
         # Note: Reports are kept for historical reference but video_id is nullified
         await self.db.reports.update_many(
@@ -2,57 +2,119 @@ import cv2
 import numpy as np
 import base64
 import os
-from typing import List, Dict, Any
-import asyncio
-import openai
+from typing import List, Dict, Any, Tuple
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 from pathlib import Path
+from services.compute_pool import run_cpu_bound
+from services.openai_client import get_openai_client
+from services.structured_output import request_structured
+from models.video import PresenceMetrics
 
 ROOT_DIR = Path(__file__).parent.parent
 load_dotenv(ROOT_DIR / '.env')
 
-class VisionAnalysisService:
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-        self.client = openai.OpenAI(api_key=api_key)
+FIRST_IMPRESSION_WINDOW_SECONDS = 8.0
+FIRST_IMPRESSION_FRAMES = 3
+UNIFORM_FRAMES = 5
+
+
+def plan_frame_timestamps(duration: float) -> Tuple[List[float], int]:
+    """Pick the timestamps worth sending: a dense window over the opening seconds
+    for first-impression scoring plus a uniform spread over the rest of the video.
+
+    Returns (timestamps, number of timestamps inside the first-impression window).
+    """
+    if not duration or duration <= 0:
+        duration = FIRST_IMPRESSION_WINDOW_SECONDS
     
-    def extract_frames(self, video_path: str, fps: int = 2) -> List[str]:
-        cap = cv2.VideoCapture(video_path)
-        video_fps = cap.get(cv2.CAP_PROP_FPS)
-        
-        # Handle edge cases where video_fps might be 0 or invalid
-        if video_fps <= 0:
-            video_fps = 30  # Default to 30 fps if detection fails
+    window = min(FIRST_IMPRESSION_WINDOW_SECONDS, duration)
+    timestamps = [window * (i + 0.5) / FIRST_IMPRESSION_FRAMES for i in range(FIRST_IMPRESSION_FRAMES)]
+    
+    remaining = duration - window
+    if remaining >= 1.0:
+        timestamps.extend(window + remaining * (i + 0.5) / UNIFORM_FRAMES for i in range(UNIFORM_FRAMES))
+    
+    return [round(t, 2) for t in timestamps], FIRST_IMPRESSION_FRAMES
+
+
+def extract_frames_at(video_path: str, timestamps: List[float] = None) -> List[str]:
+    """Decode only the frames at `timestamps`, seeking over long gaps and
+    grabbing (without retrieving) across short ones. CPU-bound, so
+    picklable for the shared compute pool."""
+    cap = cv2.VideoCapture(video_path)
+    video_fps = cap.get(cv2.CAP_PROP_FPS)
+    
+    # Handle edge cases where video_fps might be 0 or invalid
+    if video_fps <= 0:
+        video_fps = 30  # Default to 30 fps if detection fails
+    
+    if timestamps is None:
+        total_frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        timestamps, _ = plan_frame_timestamps(total_frames / video_fps if total_frames > 0 else 0)
+    
+    seek_threshold = int(video_fps * 2)
+    frames_base64 = []
+    position = 0
+    
+    for target in sorted(int(t * video_fps) for t in timestamps):
+        if target < position:
+            continue
+        if target - position > seek_threshold:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            position = target
         
-        frame_interval = max(1, int(video_fps / fps))  # Ensure minimum interval of 1
+        skipped = True
+        while position < target and skipped:
+            skipped = cap.grab()
+            position += 1
         
-        frames_base64 = []
-        frame_count = 0
+        ret, frame = cap.read()
+        if not ret:
+            break
+        position += 1
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            if frame_count % frame_interval == 0:
-                _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
-                frame_base64 = base64.b64encode(buffer).decode('utf-8')
-                frames_base64.append(frame_base64)
-            
-            frame_count += 1
-            
-            if len(frames_base64) >= 60:
-                break
+        frames_base64.append(_encode_frame(frame))
+    
+    cap.release()
+    return frames_base64
+
+
+def _encode_frame(frame) -> str:
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
+    return base64.b64encode(buffer).decode('utf-8')
+
+
+class VisionAnalysisService:
+    def __init__(self, client: AsyncOpenAI = None):
+        self.client = client or get_openai_client()
+    
+    def plan_frame_timestamps(self, duration: float) -> Tuple[List[float], int]:
+        return plan_frame_timestamps(duration)
+    
+    async def extract_frames(self, video_path: str, timestamps: List[float] = None) -> List[str]:
+        return await run_cpu_bound(extract_frames_at, video_path, timestamps)
+    
+    def select_frames(self, frame_paths: List[str], frame_fps: float, timestamps: List[float]) -> List[str]:
+        """Base64-encode only the media-prep JPEGs closest to `timestamps`"""
+        if not frame_paths:
+            return []
         
-        cap.release()
+        frames_base64 = []
+        for t in timestamps:
+            index = min(len(frame_paths) - 1, int(t * frame_fps))
+            with open(frame_paths[index], "rb") as f:
+                frames_base64.append(base64.b64encode(f.read()).decode('utf-8'))
         return frames_base64
     
-    async def analyze_with_gpt4o(self, frames: List[str]) -> Dict[str, Any]:
-        sample_frames = frames[::max(1, len(frames) // 10)][:10]
+    async def analyze_with_gpt4o(self, frames: List[str], first_impression_frames: int = 0) -> Dict[str, Any]:
+        sample_frames = frames[:FIRST_IMPRESSION_FRAMES + UNIFORM_FRAMES]
+        
+        frame_context = ""
+        if first_impression_frames:
+            frame_context = f"\nFrames are in chronological order; the first {first_impression_frames} come from the opening {FIRST_IMPRESSION_WINDOW_SECONDS:.0f} seconds.\n"
         
-        analysis_prompt = """Analyze this executive's presence in these video frames. Provide scores (0-100) for:
+        analysis_prompt = f"""Analyze this executive's presence in these video frames.{frame_context} Provide scores (0-100) for:
         
 1. **Posture**: Percentage of frames with upright, open posture
 2. **Eye Contact**: Estimated ratio looking at camera (0.0-1.0)
@@ -60,15 +122,7 @@ class VisionAnalysisService:
 4. **Gesture Rate**: Average gestures per minute
 5. **First Impression**: Score for first 7-10 seconds
 
-Provide response as JSON:
-{
-  "posture_score": float,
-  "eye_contact_ratio": float,
-  "facial_expressions": {"neutral": float, "positive": float, "negative": float},
-  "gesture_rate": float,
-  "first_impression_score": float,
-  "notes": "Brief observation"
-}"""
+Add a brief observation in notes."""
         
         messages = [
             {
@@ -79,7 +133,7 @@ Provide response as JSON:
             }
         ]
         
-        for idx, frame in enumerate(sample_frames[:5]):
+        for frame in sample_frames:
             messages[0]["content"].append({
                 "type": "image_url",
                 "image_url": {
@@ -87,37 +141,8 @@ Provide response as JSON:
                 }
             })
         
-        try:
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                model="gpt-4o",
-                messages=messages,
-                max_tokens=500
-            )
-            
-            import json
-            result_text = response.choices[0].message.content
-            
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start != -1 and json_end != 0:
-                result = json.loads(result_text[json_start:json_end])
-            else:
-                result = {
-                    "posture_score": 70.0,
-                    "eye_contact_ratio": 0.6,
-                    "facial_expressions": {"neutral": 50.0, "positive": 40.0, "negative": 10.0},
-                    "gesture_rate": 5.0,
-                    "first_impression_score": 70.0
-                }
-            
-            return result
-        except Exception as e:
-            return {
-                "posture_score": 0,
-                "eye_contact_ratio": 0,
-                "facial_expressions": {"neutral": 0, "positive": 0, "negative": 0},
-                "gesture_rate": 0,
-                "first_impression_score": 0,
-                "error": str(e)
-            }
\ No newline at end of file
+        result = await request_structured(
+            self.client, PresenceMetrics, messages,
+            max_tokens=500, endpoint="vision"
+        )
+        return result.model_dump()
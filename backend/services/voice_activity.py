@@ -0,0 +1,114 @@
+"""
+Voice Activity Detection
+Energy + zero-crossing-rate VAD over the extracted PCM. Features are computed
+per 20 ms frame, block by block, inside the streaming vocal analysis loop.
+The frames are then classified in one vectorized pass into speech/silence
+segments, giving true pause durations and speaking time without relying on
+Whisper word gaps.
+"""
+import numpy as np
+from typing import Dict, Any, List, Tuple
+
+VAD_FRAME_SECONDS = 0.02
+# Speech threshold: 10 dB above the noise floor, but never more than 35 dB below the loud end
+VAD_NOISE_MARGIN_DB = 10.0
+VAD_DYNAMIC_RANGE_DB = 35.0
+# Unvoiced consonants (s, f, sh) are quiet but noisy: accept them a little below the threshold
+VAD_FRICATIVE_MARGIN_DB = 6.0
+VAD_FRICATIVE_ZCR = 0.25
+VAD_MIN_SPEECH_SECONDS = 0.06
+VAD_HANGOVER_SECONDS = 0.15
+MIN_PAUSE_SECONDS = 0.3
+
+
+def classify_pause(duration: float) -> str:
+    return "brief" if duration < 1.0 else "strategic" if duration < 2.0 else "long"
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) frame indices of the True runs in `mask`"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return edges[::2], edges[1::2]
+
+
+class VoiceActivityDetector:
+    def __init__(self, sr: int):
+        self.sr = sr
+        self.frame = max(1, int(sr * VAD_FRAME_SECONDS))
+        self._energy: List[np.ndarray] = []
+        self._zcr: List[np.ndarray] = []
+        self._remainder = np.zeros(0, dtype=np.float32)
+
+    def update(self, y: np.ndarray):
+        """Add the next contiguous stretch of float samples (no overlap with the previous one)"""
+        if self._remainder.size:
+            y = np.concatenate((self._remainder, y))
+        n_frames = len(y) // self.frame
+        self._remainder = y[n_frames * self.frame:].copy()
+        if n_frames == 0:
+            return
+        frames = y[:n_frames * self.frame].reshape(n_frames, self.frame)
+        self._energy.append((frames * frames).mean(axis=1))
+        signs = np.signbit(frames)
+        self._zcr.append((signs[:, 1:] != signs[:, :-1]).mean(axis=1))
+
+    def speech_segments(self) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Start/end frame indices of speech segments, and the total number of frames"""
+        if not self._energy:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int), 0
+        energy_db = 10 * np.log10(np.concatenate(self._energy) + 1e-10)
+        zcr = np.concatenate(self._zcr)
+
+        noise_floor, loud = np.percentile(energy_db, [10, 99])
+        threshold = max(noise_floor + VAD_NOISE_MARGIN_DB, loud - VAD_DYNAMIC_RANGE_DB)
+        speech = (energy_db > threshold) | (
+            (energy_db > threshold - VAD_FRICATIVE_MARGIN_DB) & (zcr > VAD_FRICATIVE_ZCR)
+        )
+
+        starts, ends = _runs(speech)
+        if starts.size:
+            # Bridge gaps shorter than the hangover, then drop clicks shorter than a phoneme
+            keep_gap = (starts[1:] - ends[:-1]) >= round(VAD_HANGOVER_SECONDS / VAD_FRAME_SECONDS)
+            starts = starts[np.concatenate(([True], keep_gap))]
+            ends = ends[np.concatenate((keep_gap, [True]))]
+            long_enough = (ends - starts) >= round(VAD_MIN_SPEECH_SECONDS / VAD_FRAME_SECONDS)
+            starts, ends = starts[long_enough], ends[long_enough]
+        return starts, ends, len(energy_db)
+
+    def result(self) -> Dict[str, Any]:
+        """Pauses between speech segments plus speaking-time totals"""
+        starts, ends, n_frames = self.speech_segments()
+        total_seconds = (n_frames * self.frame + self._remainder.size) / self.sr
+        if starts.size == 0:
+            return {
+                "pauses": [],
+                "speaking_time_seconds": 0.0,
+                "speaking_ratio": 0.0,
+                "speech_segment_count": 0,
+                "leading_silence_seconds": round(total_seconds, 2),
+                "trailing_silence_seconds": 0.0
+            }
+
+        gap_starts = ends[:-1] * VAD_FRAME_SECONDS
+        gap_ends = starts[1:] * VAD_FRAME_SECONDS
+        durations = gap_ends - gap_starts
+        is_pause = durations >= MIN_PAUSE_SECONDS
+        pauses = [
+            {
+                "start": round(float(start), 2),
+                "end": round(float(end), 2),
+                "duration": round(float(duration), 2),
+                "type": classify_pause(float(duration))
+            }
+            for start, end, duration in zip(gap_starts[is_pause], gap_ends[is_pause], durations[is_pause])
+        ]
+
+        speaking_seconds = float((ends - starts).sum()) * VAD_FRAME_SECONDS
+        return {
+            "pauses": pauses,
+            "speaking_time_seconds": round(speaking_seconds, 2),
+            "speaking_ratio": round(speaking_seconds / total_seconds, 3) if total_seconds else 0.0,
+            "speech_segment_count": int(starts.size),
+            "leading_silence_seconds": round(float(starts[0]) * VAD_FRAME_SECONDS, 2),
+            "trailing_silence_seconds": round(max(0.0, total_seconds - float(ends[-1]) * VAD_FRAME_SECONDS), 2)
+        }
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Filler detection benchmark
+Compares the original per-word loop over ten uncompiled regexes with the
+token-trie FillerDetector on a synthetic Whisper word list.
+
+Usage: python tests/bench_filler_detection.py [--words 10000] [--repeat 20]
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.filler_detection import get_filler_detector, normalize_words
+
+ORIGINAL_PATTERNS = [
+    r'\bum\b', r'\buh\b', r'\blike\b', r'\byou know\b',
+    r'\bactually\b', r'\bbasically\b', r'\bliterally\b',
+    r'\bso\b', r'\bI mean\b', r'\bright\b'
+]
+
+VOCABULARY = ("we need to decide on the plan because our customers expect clear leadership "
+              "and the team will deliver results this quarter").split()
+FILLER_PHRASES = ["Um,", "uh", "like", "So,", "actually", "right?", "you know", "I mean", "basically"]
+
+
+def synthetic_words(count: int, filler_ratio: float = 0.06):
+    rng = random.Random(0)
+    words, t = [], 0.0
+    while len(words) < count:
+        text = rng.choice(FILLER_PHRASES) if rng.random() < filler_ratio else rng.choice(VOCABULARY)
+        for token in text.split():
+            words.append({"word": f" {token}", "start": round(t, 2), "end": round(t + 0.3, 2)})
+            t += 0.4
+    return words[:count]
+
+
+def regex_loop(words):
+    """The original implementation, kept here as the baseline"""
+    fillers = []
+    for word_data in words:
+        word = word_data.get('word', '').strip().lower()
+        for pattern in ORIGINAL_PATTERNS:
+            if re.match(pattern, word):
+                fillers.append({"timestamp": round(word_data.get('start', 0), 2), "word": word, "type": "filler"})
+                break
+    return fillers
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark filler word detection")
+    parser.add_argument("--words", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    words = synthetic_words(args.words)
+    detector = get_filler_detector("en")
+
+    old, old_s = timed(lambda: regex_loop(words), args.repeat)
+    new, new_s = timed(lambda: detector.find(words), args.repeat)
+    tokens = normalize_words(words)
+    _, scan_s = timed(lambda: detector.find(words, tokens), args.repeat)
+
+    multi_word = [f for f in new if " " in f["word"]]
+    print(f"{len(words)} words, mean of {args.repeat} runs")
+    print(f"regex loop (old):          {old_s * 1000:8.2f} ms  {len(old)} fillers, multi-word: 0")
+    print(f"trie incl. normalization:  {new_s * 1000:8.2f} ms  {len(new)} fillers, multi-word: {len(multi_word)} "
+          f"({old_s / max(new_s, 1e-9):.1f}x faster)")
+    print(f"trie on shared tokens:     {scan_s * 1000:8.2f} ms  ({old_s / max(scan_s, 1e-9):.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
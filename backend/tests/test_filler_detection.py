@@ -0,0 +1,32 @@
+"""
+Offline tests for the filler-word trie.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.filler_detection import get_filler_detector
+
+
+def words(text, spacing=0.5):
+    return [{"word": t, "start": i * spacing, "end": i * spacing + 0.4} for i, t in enumerate(text.split())]
+
+
+def test_multi_word_fillers_keep_first_start_and_last_end():
+    fillers = get_filler_detector("en").find(words("Um, you know, we shipped it."))
+
+    assert [f["word"] for f in fillers] == ["um", "you know"]
+    assert (fillers[1]["timestamp"], fillers[1]["end"]) == (0.5, 1.4)
+
+
+def test_content_phrases_are_not_fillers():
+    assert get_filler_detector("en").find(words("What kind of product do we sell?")) == []
+    assert get_filler_detector("es").find(words("Es como un producto nuevo")) == []
+
+
+def test_punctuation_only_words_after_a_phrase():
+    fillers = get_filler_detector("en").find(words("you know — what ..."))
+
+    assert [f["word"] for f in fillers] == ["you know"]
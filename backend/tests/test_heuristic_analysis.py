@@ -0,0 +1,46 @@
+"""
+Offline tests for the LLM-free gravitas and storytelling heuristics.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from models.video import GravitasMetrics, StorytellingMetrics
+from services.heuristic_analysis import HeuristicAnalysisService
+from services.transcript_structure import TranscriptStructure
+
+DECISIVE = "We will enter the market this year because our customers need it. I decided to lead the launch myself."
+HEDGING = "I think we could maybe look at the market. It's probably sort of worth it, I guess."
+STORY = ("A few years ago I was running a team of 12 engineers in Berlin. "
+         "But then our biggest client suddenly cancelled. "
+         "Eventually we rebuilt the product and I learned to diversify early.")
+
+service = HeuristicAnalysisService()
+
+
+def test_decisive_language_scores_above_hedging():
+    decisive = service.analyze_gravitas(TranscriptStructure.build({"text": DECISIVE}))
+    hedging = service.analyze_gravitas(TranscriptStructure.build({"text": HEDGING}))
+
+    assert decisive["decisiveness"] > hedging["decisiveness"]
+    assert decisive["lexicon"]["examples"]["reasoning"] == ["because"]
+    assert "i think" in hedging["lexicon"]["examples"]["hedges"]
+    GravitasMetrics(**decisive)
+
+
+def test_story_with_complication_and_resolution():
+    result = service.analyze_storytelling(TranscriptStructure.build({"text": DECISIVE + " " + STORY}))
+
+    assert result["has_story"] is True
+    assert result["story_excerpt"].startswith("A few years ago")
+    StorytellingMetrics(**result)
+
+
+def test_no_story_without_a_narrative():
+    result = service.analyze_storytelling(TranscriptStructure.build({"text": DECISIVE}))
+
+    assert result["has_story"] is False
+    assert result["narrative_structure"] is None
+    StorytellingMetrics(**result)
@@ -0,0 +1,114 @@
+"""
+Offline tests for dependency scheduling and checkpoint skipping in run_stage_graph.
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.pipeline import Stage, run_stage_graph
+
+# Same shape as VideoProcessorService's full-tier graph
+GRAPH = {
+    "media": [],
+    "transcription": ["media"],
+    "vocal": ["media"],
+    "communication": ["transcription", "vocal"],
+    "presence": ["media"],
+    "nlp": ["transcription", "communication", "presence"],
+    "scoring": ["communication", "presence", "nlp"],
+}
+
+
+def build(graph=GRAPH, log=None, fail=None, delays=None):
+    log = [] if log is None else log
+
+    def runner(name):
+        async def run(results):
+            log.append(("start", name))
+            await asyncio.sleep((delays or {}).get(name, 0))
+            if name == fail:
+                raise RuntimeError(f"{name} failed")
+            assert all(dep in results for dep in graph[name])
+            log.append(("end", name))
+            return f"{name}-output"
+        return run
+
+    return [Stage(name, runner(name), deps) for name, deps in graph.items()], log
+
+
+def started(log):
+    return [name for event, name in log if event == "start"]
+
+
+def test_runs_every_stage_after_its_dependencies():
+    stages, log = build()
+    results = asyncio.run(run_stage_graph(stages))
+
+    assert set(results) == set(GRAPH)
+    ended = [name for event, name in log if event == "end"]
+    for name, deps in GRAPH.items():
+        assert all(ended.index(dep) < started(log).index(name) for dep in deps)
+
+
+def test_independent_branches_overlap():
+    stages, log = build(delays={"transcription": 0.05, "presence": 0.05})
+    asyncio.run(run_stage_graph(stages))
+
+    # presence starts before transcription ends
+    assert log.index(("start", "presence")) < log.index(("end", "transcription"))
+
+
+def test_restored_checkpoints_skip_stages_and_unneeded_media():
+    restored = {name: f"{name}-checkpoint" for name in ("transcription", "vocal", "communication", "presence")}
+    stages, log = build()
+    results = asyncio.run(run_stage_graph(stages, results=restored))
+
+    assert started(log) == ["nlp", "scoring"]
+    assert results["communication"] == "communication-checkpoint"
+    assert "media" not in results
+
+
+def test_media_still_runs_when_a_consumer_is_missing():
+    restored = {name: "checkpoint" for name in ("transcription", "vocal", "communication")}
+    stages, log = build()
+    asyncio.run(run_stage_graph(stages, results=restored))
+
+    assert started(log) == ["media", "presence", "nlp", "scoring"]
+
+
+def test_failure_cancels_running_stages():
+    stages, log = build(fail="vocal", delays={"transcription": 0.2, "presence": 0.2})
+    with pytest.raises(RuntimeError, match="vocal failed"):
+        asyncio.run(run_stage_graph(stages))
+
+    assert ("end", "transcription") not in log
+    assert ("end", "presence") not in log
+    assert "communication" not in started(log)
+
+
+def test_completion_callback_sees_each_result():
+    seen = []
+
+    async def on_complete(stage, results):
+        seen.append((stage.name, results[stage.name]))
+
+    stages, _ = build()
+    asyncio.run(run_stage_graph(stages, on_stage_complete=on_complete))
+    assert sorted(seen) == sorted((name, f"{name}-output") for name in GRAPH)
+
+
+def test_unknown_dependency_is_rejected():
+    stages, _ = build({"a": ["missing"]})
+    with pytest.raises(ValueError, match="unknown stages"):
+        asyncio.run(run_stage_graph(stages))
+
+
+def test_dependency_cycle_is_detected():
+    stages, log = build({"a": ["b"], "b": ["a"], "c": []})
+    with pytest.raises(ValueError, match="cycle"):
+        asyncio.run(run_stage_graph(stages))
@@ -0,0 +1,86 @@
+"""
+Offline tests for schema-validated LLM responses, using a fake chat client.
+"""
+
+import sys
+import json
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from models.video import PresenceMetrics, CombinedNLPAnalysis
+from services.structured_output import request_structured, strict_json_schema, StructuredOutputError
+from services.nlp_analysis import NLPAnalysisService
+
+VALID_PRESENCE = {
+    "posture_score": 80,
+    "eye_contact_ratio": 0.7,
+    "facial_expressions": {"neutral": 50, "positive": 40, "negative": 10},
+    "gesture_rate": 3,
+    "first_impression_score": 75,
+    "notes": None
+}
+
+
+class FakeCompletions:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        message = SimpleNamespace(content=self.replies.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def fake_client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+def run(replies, model_cls=PresenceMetrics):
+    completions = FakeCompletions(replies)
+    client = fake_client(completions)
+    messages = [{"role": "user", "content": "analyze"}]
+    return asyncio.run(request_structured(client, model_cls, messages)), completions
+
+
+def test_strict_schema_requires_every_property():
+    schema = strict_json_schema(CombinedNLPAnalysis)
+    for node in (schema, schema["properties"]["gravitas"], schema["properties"]["storytelling"]):
+        assert node["additionalProperties"] is False
+        assert set(node["required"]) == set(node["properties"])
+    assert "$defs" not in json.dumps(schema)
+
+
+def test_valid_reply_needs_one_call():
+    result, completions = run([json.dumps(VALID_PRESENCE)])
+    assert result.posture_score == 80
+    assert len(completions.calls) == 1
+    assert completions.calls[0]["response_format"]["json_schema"]["strict"] is True
+
+
+def test_invalid_reply_is_repaired_once():
+    bad = {**VALID_PRESENCE, "posture_score": 180}
+    result, completions = run([json.dumps(bad), json.dumps(VALID_PRESENCE)])
+    assert result.posture_score == 80
+    repair_prompt = completions.calls[1]["messages"][-1]["content"]
+    assert "posture_score" in repair_prompt
+
+
+def test_gives_up_after_failed_repair():
+    with pytest.raises(StructuredOutputError):
+        run(["{not json", json.dumps({"posture_score": 50})])
+
+
+def test_coaching_tips_from_structured_reply():
+    completions = FakeCompletions([json.dumps({"tips": ["Pause before key points", "Cut fillers"]})])
+    service = NLPAnalysisService(client=fake_client(completions))
+    metrics = {"communication": {"speaking_rate": {"wpm": 180, "word_count": 900}}, "scores": {"overall": 62, "communication": 55}}
+
+    tips = asyncio.run(service.generate_coaching_tips(metrics))
+    assert tips == ["Pause before key points", "Cut fillers"]
+    assert "180" in completions.calls[0]["messages"][0]["content"]
@@ -0,0 +1,41 @@
+"""
+Offline tests for sentence segmentation and word alignment in TranscriptStructure.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.transcript_structure import TranscriptStructure
+
+TEXT = 'Hello everyone. Revenue grew 3.5 percent, and I said "we will win." Um, you know, the team delivered! Did we?'
+
+
+def whisper_words(text, spacing=0.5):
+    """Word timestamps the way Whisper returns them: no surrounding punctuation"""
+    tokens = [t.strip('.,!?"') for t in text.split()]
+    return [{"word": t, "start": i * spacing, "end": i * spacing + 0.4} for i, t in enumerate(tokens)]
+
+
+def test_sentences_split_on_terminal_punctuation_only():
+    structure = TranscriptStructure.build({"text": TEXT})
+    assert [s.word_count for s in structure.sentences] == [2, 10, 6, 2]
+    assert "3.5" in structure.sentences[1].text
+    assert all(s.start is None for s in structure.sentences)
+
+
+def test_sentences_map_to_word_spans_and_timestamps():
+    words = whisper_words(TEXT)
+    structure = TranscriptStructure.build({"text": TEXT, "words": words})
+
+    spans = [(s.word_start, s.word_end) for s in structure.sentences]
+    assert spans == [(0, 2), (2, 12), (12, 18), (18, 20)]
+    assert structure.sentences[2].start == words[12]["start"]
+    assert structure.sentences[2].end == words[17]["end"]
+    assert len(structure.tokens) == len(words)
+
+
+def test_longest_sentences():
+    structure = TranscriptStructure.build({"text": TEXT})
+    assert [s.index for s in structure.longest_sentences(2)] == [1, 2]
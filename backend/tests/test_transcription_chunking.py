@@ -0,0 +1,88 @@
+"""
+Offline tests for silence-based chunking and timestamp stitching of
+transcriptions, using LocalStubTranscriber in place of Whisper.
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.transcript_chunking import (
+    LocalStubTranscriber,
+    plan_chunks,
+    stitch_chunk_results,
+    write_wav_chunk,
+)
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_recording(seconds=95.0):
+    """0.3 s tone bursts ("words") every 0.8 s, with a 2 s silence after every tenth"""
+    samples = np.zeros(int(seconds * SAMPLE_RATE), dtype=np.int16)
+    tone = (8000 * np.sin(2 * np.pi * 220 * np.arange(int(0.3 * SAMPLE_RATE)) / SAMPLE_RATE)).astype(np.int16)
+    starts, t, count = [], 0.5, 0
+    while t + 0.3 < seconds:
+        i = int(t * SAMPLE_RATE)
+        samples[i:i + len(tone)] = tone
+        starts.append(t)
+        count += 1
+        t += 2.8 if count % 10 == 0 else 0.8
+    return samples, starts
+
+
+def transcribe_chunked(samples, tmp_path, chunk_seconds):
+    stub = LocalStubTranscriber()
+    chunks = plan_chunks(samples, SAMPLE_RATE, chunk_seconds, search_seconds=5.0, overlap_seconds=1.0)
+
+    async def run():
+        paths = [write_wav_chunk(samples, SAMPLE_RATE, c, str(tmp_path / f"c{c.index}.wav")) for c in chunks]
+        return await asyncio.gather(*(stub(p) for p in paths))
+
+    results = asyncio.run(run())
+    return chunks, stitch_chunk_results(chunks, results, SAMPLE_RATE, len(samples)), stub
+
+
+def test_chunks_cover_recording_and_cut_in_silence(tmp_path):
+    samples, _ = synthetic_recording()
+    chunks = plan_chunks(samples, SAMPLE_RATE, 20.0, search_seconds=5.0, overlap_seconds=1.0)
+
+    assert len(chunks) > 1
+    assert chunks[0].core_start == 0 and chunks[-1].core_end == len(samples)
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert prev.core_end == nxt.core_start
+        assert samples[prev.core_end] == 0
+    for chunk in chunks:
+        assert chunk.read_end - chunk.read_start <= (20.0 + 2.0) * SAMPLE_RATE
+
+
+def test_stitched_words_match_single_pass(tmp_path):
+    samples, starts = synthetic_recording()
+    chunks, stitched, stub = transcribe_chunked(samples, tmp_path, chunk_seconds=20.0)
+
+    assert stub.calls == len(chunks) > 1
+    assert len(stitched["words"]) == len(starts)
+    got = np.array([w["start"] for w in stitched["words"]])
+    assert np.all(np.abs(got - np.array(starts)) < 0.05)
+    assert np.all(np.diff(got) > 0)
+    assert stitched["duration"] == round(len(samples) / SAMPLE_RATE, 3)
+
+
+def test_overlap_duplicates_are_dropped(tmp_path):
+    samples, starts = synthetic_recording()
+    _, stitched, _ = transcribe_chunked(samples, tmp_path, chunk_seconds=15.0)
+
+    segment_words = sum(len(s["text"].split()) for s in stitched["segments"])
+    assert segment_words == len(starts)
+    assert len(stitched["text"].split()) == len(starts)
+
+
+def test_short_recording_is_a_single_chunk():
+    samples, _ = synthetic_recording(seconds=10.0)
+    chunks = plan_chunks(samples, SAMPLE_RATE, 20.0)
+    assert len(chunks) == 1
+    assert (chunks[0].read_start, chunks[0].read_end) == (0, len(samples))
@@ -1,24 +1,59 @@
 from motor.motor_asyncio import AsyncIOMotorGridFSBucket
 from fastapi import UploadFile
+import hashlib
 import uuid
 
-async def save_video_to_gridfs(db, file: UploadFile) -> str:
+MAX_VIDEO_SIZE = 200 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class VideoTooLargeError(ValueError):
+    pass
+
+
+async def save_video_to_gridfs(db, file: UploadFile, max_size: int = MAX_VIDEO_SIZE) -> dict:
+    """Stream an upload into GridFS chunk by chunk, enforcing max_size as bytes arrive.
+
+    Returns the video_id together with the byte size and sha256 computed on the fly.
+    """
     fs = AsyncIOMotorGridFSBucket(db)
     video_id = f"video_{uuid.uuid4().hex}"
-    
-    file_data = await file.read()
-    
-    await fs.upload_from_stream(
+
+    grid_in = fs.open_upload_stream(
         video_id,
-        file_data,
+        chunk_size_bytes=UPLOAD_CHUNK_SIZE,
         metadata={
             "filename": file.filename,
-            "content_type": file.content_type,
-            "size": len(file_data)
+            "content_type": file.content_type
         }
     )
-    
-    return video_id
+
+    sha256 = hashlib.sha256()
+    size = 0
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise VideoTooLargeError(f"Video size exceeds {max_size // (1024 * 1024)}MB limit")
+            sha256.update(chunk)
+            await grid_in.write(chunk)
+    except BaseException:
+        # Removes any chunks already written for this file
+        await grid_in.abort()
+        raise
+
+    await grid_in.close()
+
+    digest = sha256.hexdigest()
+    await db.fs.files.update_one(
+        {"_id": grid_in._id},
+        {"$set": {"metadata.size": size, "metadata.sha256": digest}}
+    )
+
+    return {"video_id": video_id, "size": size, "sha256": digest}
 
 async def get_video_from_gridfs(db, video_id: str) -> bytes:
     fs = AsyncIOMotorGridFSBucket(db)
@@ -28,6 +63,26 @@ async def get_video_from_gridfs(db, video_id: str) -> bytes:
     
     return video_data
 
+async def stream_video_from_gridfs(db, video_id: str):
+    """Yield a stored video one GridFS chunk at a time"""
+    fs = AsyncIOMotorGridFSBucket(db)
+    
+    grid_out = await fs.open_download_stream_by_name(video_id)
+    while True:
+        chunk = await grid_out.readchunk()
+        if not chunk:
+            break
+        yield chunk
+
+async def download_video_to_file(db, video_id: str, dest_path: str) -> int:
+    """Copy a stored video to dest_path without holding the whole file in memory"""
+    size = 0
+    with open(dest_path, "wb") as dest:
+        async for chunk in stream_video_from_gridfs(db, video_id):
+            dest.write(chunk)
+            size += len(chunk)
+    return size
+
 async def delete_video_from_gridfs(db, video_id: str):
     fs = AsyncIOMotorGridFSBucket(db)
     
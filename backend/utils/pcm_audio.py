@@ -0,0 +1,57 @@
+import struct
+import os
+import numpy as np
+from typing import Tuple
+
+PCM_SCALE = 1.0 / 32768.0
+
+
+def read_wav_header(path: str) -> Tuple[int, int, int, int]:
+    """Walk the RIFF chunks of a 16-bit PCM WAV file.
+
+    Returns (sample_rate, channels, data_offset, data_size). Raises ValueError
+    for anything other than uncompressed 16-bit PCM.
+    """
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+
+        sample_rate = channels = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                audio_format, channels, sample_rate = struct.unpack("<HHI", fmt[:8])
+                bits_per_sample = struct.unpack("<H", fmt[14:16])[0]
+                if audio_format not in (1, 0xFFFE) or bits_per_sample != 16:
+                    raise ValueError(f"{path} is not 16-bit PCM (format={audio_format}, bits={bits_per_sample})")
+                if chunk_size % 2:
+                    f.seek(1, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if sample_rate is None:
+                    raise ValueError(f"{path} has a data chunk before its fmt chunk")
+                data_offset = f.tell()
+                # Streamed WAVs leave the size unset; trust the file length instead
+                available = os.path.getsize(path) - data_offset
+                if chunk_size == 0 or chunk_size == 0xFFFFFFFF or chunk_size > available:
+                    chunk_size = available
+                return sample_rate, channels, data_offset, chunk_size
+            else:
+                f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+
+
+def open_pcm_memmap(path: str) -> Tuple[np.memmap, int]:
+    """Memory-map the int16 PCM payload of a mono WAV file without reading it"""
+    sample_rate, channels, data_offset, data_size = read_wav_header(path)
+    if channels != 1:
+        raise ValueError(f"{path} has {channels} channels; expected mono")
+    samples = data_size // 2
+    if samples == 0:
+        return np.zeros(0, dtype=np.int16), sample_rate
+    return np.memmap(path, dtype="<i2", mode="r", offset=data_offset, shape=(samples,)), sample_rate
+
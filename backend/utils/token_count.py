@@ -0,0 +1,30 @@
+"""
+Token counting for prompt budgets. Uses tiktoken when it is installed and its
+encoding can be loaded, otherwise the ~4 characters per token rule of thumb.
+"""
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+ENCODING_NAME = "o200k_base"  # gpt-4o
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(ENCODING_NAME)
+    except Exception:
+        # The encoding file is fetched on first use; offline hosts fall back to the estimate
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
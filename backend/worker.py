@@ -0,0 +1,178 @@
+"""
+Video Analysis Worker
+Runs a pool of worker processes that consume the video_jobs queue, keeping
+ffmpeg/librosa/OpenCV work off the API event loop.
+
+Usage: python worker.py [--processes N]
+"""
+import os
+import sys
+import asyncio
+import signal
+import socket
+import logging
+import argparse
+import multiprocessing
+from pathlib import Path
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.append('/app/backend')
+
+from services.job_queue import VideoJobQueue
+from services.video_processor import VideoProcessorService
+from services.compute_pool import warm_compute_pool, shutdown_compute_pool
+from services.openai_client import close_openai_client
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = float(os.getenv("VIDEO_WORKER_POLL_SECONDS", "2"))
+
+
+async def _heartbeat(queue: VideoJobQueue, job_id: str, worker_id: str, task: asyncio.Task):
+    interval = max(1, queue.lease_seconds // 3)
+    while not task.done():
+        await asyncio.sleep(interval)
+        if not await queue.heartbeat(job_id, worker_id):
+            logger.warning(f"Worker {worker_id} lost lease on {job_id}, abandoning job")
+            task.cancel()
+            return
+
+
+async def _run_job(queue: VideoJobQueue, processor: VideoProcessorService, job: dict, worker_id: str, stop: asyncio.Event):
+    job_id = job["job_id"]
+
+    if job.get("attempts", 1) > queue.max_attempts:
+        # Reclaimed after repeated crashes mid-job
+        await queue.fail(job, worker_id, job.get("last_error") or "Worker crashed while processing this video")
+        return
+
+    logger.info(f"Worker {worker_id} processing {job_id} (attempt {job.get('attempts', 1)})")
+    task = asyncio.create_task(processor.process_video(job_id, job["video_id"], job["user_id"],
+                                                       tier=job.get("tier", "full"), report_id=job.get("report_id")))
+    heartbeat = asyncio.create_task(_heartbeat(queue, job_id, worker_id, task))
+    stopping = asyncio.create_task(stop.wait())
+
+    try:
+        await asyncio.wait({task, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await queue.release(job_id, worker_id)
+            return
+        report_id = task.result()
+        # Queued while the lease is still held, so a failure here retries through queue.fail()
+        if job.get("tier") == "fast" and job.get("refine"):
+            refinement_job_id = await queue.enqueue_refinement(job, report_id)
+            logger.info(f"Queued full analysis {refinement_job_id} to refine report {report_id}")
+        await queue.complete(job_id, worker_id)
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        await queue.fail(job, worker_id, str(e))
+    finally:
+        heartbeat.cancel()
+        stopping.cancel()
+
+
+async def run_worker(worker_id: str):
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    queue = VideoJobQueue(db)
+    processor = VideoProcessorService(db)
+    await queue.ensure_indexes()
+    await queue.reconcile_slots()
+    await processor.ensure_indexes()
+    await warm_compute_pool()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info(f"Video worker {worker_id} started")
+    while not stop.is_set():
+        try:
+            job = await queue.claim(worker_id)
+        except Exception as e:
+            logger.error(f"Worker {worker_id} failed to claim a job: {e}")
+            job = None
+
+        if job is None:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        await _run_job(queue, processor, job, worker_id, stop)
+
+    shutdown_compute_pool()
+    await close_openai_client()
+    client.close()
+    logger.info(f"Video worker {worker_id} stopped")
+
+
+def _worker_main(worker_id: str):
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(run_worker(worker_id))
+
+
+def start_worker_processes(count: int) -> list:
+    """Spawn `count` worker processes; they must not be daemonic so they can own process pools"""
+    ctx = multiprocessing.get_context("spawn")
+    processes = []
+    for i in range(count):
+        worker_id = f"{socket.gethostname()}-{os.getpid()}-{i}"
+        process = ctx.Process(target=_worker_main, args=(worker_id,), name=f"video-worker-{i}")
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def stop_worker_processes(processes: list, timeout: float = 30):
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join(timeout)
+        if process.is_alive():
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run video analysis workers")
+    parser.add_argument(
+        "--processes", type=int,
+        default=int(os.getenv("VIDEO_WORKER_PROCESSES", "2")),
+        help="Number of worker processes"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    processes = start_worker_processes(args.processes)
+    logger.info(f"Started {len(processes)} video worker processes")
+
+    def _shutdown(signum, frame):
+        stop_worker_processes(processes)
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
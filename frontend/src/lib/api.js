@@ -61,6 +61,7 @@ export const videoAPI = {
   },
   process: (videoId) => api.post(`/videos/${videoId}/process`),
   getJobStatus: (jobId) => api.get(`/jobs/${jobId}/status`),
+  retryJob: (jobId) => api.post(`/jobs/${jobId}/retry`),
 };
 
 export const reportAPI = {
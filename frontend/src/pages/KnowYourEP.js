@@ -214,7 +214,12 @@ const KnowYourEP = () => {
         setProgress(job.progress);
         setCurrentStep(job.current_step);
         
-        if (job.status === 'completed') {
+        if (job.status !== 'completed' && job.status !== 'failed' && job.report_id && job.sections_ready?.includes('communication')) {
+          // First sections are published; the report page keeps refreshing until the rest arrive
+          clearInterval(interval);
+          toast.success('First results ready!');
+          navigate(`/report/${job.report_id}`);
+        } else if (job.status === 'completed') {
           clearInterval(interval);
           toast.success('Analysis complete!');
           
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { Button } from '../components/ui/button';
-import { reportAPI } from '../lib/api';
+import { reportAPI, videoAPI } from '../lib/api';
 import { toast } from 'sonner';
 import { ArrowLeft, Download, Share2, TrendingUp, AlertTriangle, CheckCircle, Info, ChevronDown, ChevronUp, ExternalLink, Loader2 } from 'lucide-react';
 import { getScoreLabel, formatTimestamp } from '../lib/utils';
@@ -35,6 +35,35 @@ const Report = () => {
     fetchReport();
   }, [reportId, navigate]);
   
+  // Sections are published as analysis stages finish; keep refreshing until the report is final
+  const inProgress = report && (report.status === 'processing' || report.refinement_status === 'processing');
+  useEffect(() => {
+    if (!inProgress) return;
+    const interval = setInterval(async () => {
+      try {
+        const response = await reportAPI.getReport(reportId);
+        setReport(response.data);
+      } catch (error) {
+        console.error('Error refreshing report:', error);
+      }
+    }, 3000);
+    return () => clearInterval(interval);
+  }, [inProgress, reportId]);
+  
+  const analysisFailed = report && report.status === 'failed';
+  const refinementFailed = report && report.refinement_status === 'failed';
+  
+  const handleRetry = async () => {
+    const jobId = analysisFailed ? report.job_id : report.refinement_job_id;
+    try {
+      await videoAPI.retryJob(jobId);
+      toast.success('Analysis resumed');
+      setReport(prev => analysisFailed ? {...prev, status: 'processing'} : {...prev, refinement_status: 'processing'});
+    } catch (error) {
+      toast.error('Could not retry: ' + (error.response?.data?.detail || 'please try again later'));
+    }
+  };
+  
   const handleDownloadPDF = async () => {
     if (!report) return;
     
@@ -152,6 +181,43 @@ const Report = () => {
       </nav>
       
       <div className="container mx-auto px-6 py-12 max-w-6xl">
+        {(inProgress || analysisFailed || report.tier === 'fast') && (
+          <div style={{
+            display: 'flex',
+            alignItems: 'center',
+            gap: '12px',
+            backgroundColor: analysisFailed || refinementFailed ? '#FEF2F2' : '#FFFBEB',
+            border: analysisFailed || refinementFailed ? '1px solid #EF4444' : '1px solid #D4AF37',
+            borderRadius: '12px',
+            padding: '12px 16px',
+            marginBottom: '32px',
+            color: '#0F172A',
+            fontSize: '14px'
+          }} data-testid="report-progress">
+            {inProgress
+              ? <Loader2 className="h-4 w-4 animate-spin" style={{color: '#D4AF37'}} />
+              : analysisFailed || refinementFailed
+                ? <AlertTriangle className="h-4 w-4" style={{color: '#EF4444'}} />
+                : <Info className="h-4 w-4" style={{color: '#D4AF37'}} />}
+            <span style={{flex: 1}}>
+              {report.status === 'processing'
+                ? `Analysis in progress. Sections appear as they finish (ready: ${(report.sections_ready || []).join(', ') || 'none yet'}).`
+                : analysisFailed
+                  ? 'Analysis failed before the report was finished. Sections without a score could not be analyzed.'
+                  : report.refinement_status === 'processing'
+                    ? 'This is a quick preview. The full AI analysis is running and will update this report.'
+                    : refinementFailed
+                      ? 'This is a quick preview. The full AI analysis could not be completed.'
+                      : 'This is a quick preview based on your transcript and voice only.'}
+            </span>
+            {(analysisFailed || refinementFailed) && (
+              <Button variant="outline" size="sm" onClick={handleRetry} data-testid="retry-analysis">
+                Retry analysis
+              </Button>
+            )}
+          </div>
+        )}
+        
         {/* Header Section */}
         <div style={{textAlign: 'center', marginBottom: '48px'}} data-testid="report-header">
           <h1 style={{fontSize: '48px', fontWeight: 700, color: '#0F172A', marginBottom: '12px'}}>
@@ -180,7 +246,7 @@ const Report = () => {
                 color: '#D4AF37',
                 lineHeight: 1
               }} data-testid="overall-score">
-                {report.overall_score}
+                {report.overall_score ?? '…'}
               </div>
               <div style={{fontSize: '14px', color: '#64748B', marginTop: '4px'}}>Overall EP Score</div>
             </div>
@@ -290,7 +356,7 @@ const Report = () => {
                   fontSize: '28px',
                   fontWeight: 700,
                   color: getScoreColor(report.communication_score)
-                }}>{Math.round(report.communication_score)}</span>
+                }}>{report.communication_score != null ? Math.round(report.communication_score) : '…'}</span>
                 {expandedSections.communication ? <ChevronUp style={{color: '#D4AF37'}} /> : <ChevronDown style={{color: '#64748B'}} />}
               </div>
             </button>
@@ -467,7 +533,7 @@ const Report = () => {
                   fontSize: '28px',
                   fontWeight: 700,
                   color: getScoreColor(report.presence_score)
-                }}>{Math.round(report.presence_score)}</span>
+                }}>{report.presence_score != null ? Math.round(report.presence_score) : '…'}</span>
                 {expandedSections.presence ? <ChevronUp style={{color: '#D4AF37'}} /> : <ChevronDown style={{color: '#64748B'}} />}
               </div>
             </button>
@@ -577,7 +643,7 @@ const Report = () => {
                   fontSize: '28px',
                   fontWeight: 700,
                   color: getScoreColor(report.gravitas_score)
-                }}>{Math.round(report.gravitas_score)}</span>
+                }}>{report.gravitas_score != null ? Math.round(report.gravitas_score) : '…'}</span>
                 {expandedSections.gravitas ? <ChevronUp style={{color: '#D4AF37'}} /> : <ChevronDown style={{color: '#64748B'}} />}
               </div>
             </button>
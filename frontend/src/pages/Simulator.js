@@ -119,7 +119,12 @@ const Simulator = () => {
         const statusResponse = await videoAPI.getJobStatus(jobId);
         const job = statusResponse.data;
         
-        if (job.status === 'completed') {
+        if (job.status !== 'completed' && job.status !== 'failed' && job.report_id && job.sections_ready?.includes('communication')) {
+          // First sections are published; the report page keeps refreshing until the rest arrive
+          clearInterval(pollInterval);
+          toast.success('First results ready!');
+          navigate(`/report/${job.report_id}`);
+        } else if (job.status === 'completed') {
           clearInterval(pollInterval);
           toast.success('Analysis complete!');
           setTimeout(() => {